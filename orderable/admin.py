@@ -1,17 +1,28 @@
+import json
+
 from django.contrib import admin
-from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import models, transaction
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotAllowed,
+    JsonResponse,
+)
+from django.shortcuts import get_object_or_404
 from django.urls import path
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
 
+from .forms import OrderableInlineFormSet
+
 
 csrf_protect_m = method_decorator(csrf_protect)
 
 
 class OrderableAdmin(admin.ModelAdmin):
     """
-    jQuery orderable objects in the admin.
+    Drag-and-drop orderable objects in the admin.
 
     You'll want your object to subclass orderable.models.Orderable and you
     want to add sort_order_display to list_display.
@@ -32,6 +43,14 @@ class OrderableAdmin(admin.ModelAdmin):
                 name=self.get_url_name()
             )
         )
+        patterns.insert(
+            -1,
+            path(
+                'reorder/move/',
+                self.move_view,
+                name='{}_move'.format(self.get_url_name())
+            )
+        )
         return patterns
 
     def get_url_name(self):
@@ -44,35 +63,106 @@ class OrderableAdmin(admin.ModelAdmin):
 
     @csrf_protect_m
     def reorder_view(self, request):
-        """The 'reorder' admin view for this model."""
+        """
+        The 'reorder' admin view for this model.
+
+        Accepts the pk of the `moved` object and the pk of the object it was dropped
+        `before` or `after`, and moves just that object. This works on any page of a
+        paginated changelist. Also accepts the full `neworder[]` of the objects.
+        """
         model = self.model
 
         if not self.has_change_permission(request):
             raise PermissionDenied
 
         if request.method == "POST":
+            if 'moved' in request.POST:
+                return self._reorder_move(request)
             object_pks = request.POST.getlist('neworder[]')
             model.objects.set_orders(object_pks)
 
         return HttpResponse("OK")
 
-    class Media:
-        js = (
-            '//ajax.googleapis.com/ajax/libs/jquery/1.11.2/jquery.min.js',
-            '//ajax.googleapis.com/ajax/libs/jqueryui/1.11.2/jquery-ui.min.js',
+    def _reorder_move(self, request):
+        """Move the `moved` object next to its new `before` or `after` neighbour."""
+        queryset = self.get_queryset(request)
+        try:
+            moved = get_object_or_404(queryset, pk=request.POST['moved'])
+            self._move_object(queryset, moved, request.POST)
+        except (ValueError, ValidationError) as e:
+            return HttpResponseBadRequest(str(e))
+
+        return HttpResponse("OK")
+
+    @csrf_protect_m
+    def move_view(self, request):
+        """
+        Move one object, and respond with the new sort_order of each object moved.
+
+        Takes a JSON object with the object's `pk`, its `version` (the sort_order the
+        client last saw it at), and either a target `position` (a sort_order) or the
+        pk of the object to move it `before` or `after`. Responds with 409 Conflict,
+        and the current sort_order, if the object has moved since.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+
+        queryset = self.get_queryset(request)
+        try:
+            data = json.loads(request.body.decode('utf-8'))
+            moved = get_object_or_404(queryset, pk=data['pk'])
+            version = int(data['version'])
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            return JsonResponse({'error': 'Invalid request: {}'.format(e)}, status=400)
+
+        with transaction.atomic():
+            # Lock the object's row, so it can't move between the check and the move.
+            current = self.model._base_manager.select_for_update().filter(
+                pk=moved.pk,
+            ).values_list('sort_order', flat=True).get()
+            if current != version:
+                return JsonResponse(
+                    {'error': 'The object has been moved.', 'sort_order': current},
+                    status=409,
+                )
+
+            try:
+                changed = self._move_object(queryset, moved, data)
+            except (TypeError, ValueError, ValidationError) as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            orders = list(changed.values_list('pk', 'sort_order'))
+
+        return JsonResponse({'orders': {str(pk): order for pk, order in orders}})
+
+    def _move_object(self, queryset, moved, data):
+        """Move `moved` to `data`'s `position`, or `before` or `after` another pk."""
+        if 'position' in data:
+            return moved.move_to(self._get_position(moved, data['position']))
+        if 'before' in data:
+            return moved.move_above(get_object_or_404(queryset, pk=data['before']))
+        if 'after' in data:
+            return moved.move_below(get_object_or_404(queryset, pk=data['after']))
+        raise ValueError('Send a "position", or the pk of a "before" or "after" object.')
+
+    def _get_position(self, moved, position):
+        """Check that `position` is a sort_order within the ends of `moved`'s list."""
+        position = int(position)
+        ends = moved.get_filtered_manager().aggregate(
+            first=models.Min('sort_order'), end=models.Max('sort_order'),
         )
+        if not ends['first'] <= position <= ends['end']:
+            raise ValueError('The position must be from {first} to {end}.'.format(**ends))
+        return position
 
 
 class OrderableTabularInline(admin.TabularInline):
     """
-    jQuery orderable objects in the admin.
+    Drag-and-drop orderable objects in the admin.
 
-    You'll want your object to subclass orderable.models.Orderable.
+    You'll want your object to subclass orderable.models.Orderable. Any custom
+    `formset` should subclass orderable.forms.OrderableInlineFormSet.
     """
     template = "admin/edit_inline/orderable_tabular.html"
-
-    class Media:
-        js = (
-            '//ajax.googleapis.com/ajax/libs/jquery/1.11.2/jquery.min.js',
-            '//ajax.googleapis.com/ajax/libs/jqueryui/1.11.2/jquery-ui.min.js',
-        )
+    formset = OrderableInlineFormSet
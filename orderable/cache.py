@@ -0,0 +1,90 @@
+"""
+Caches of the highest sort_order in each list, so appends can skip the aggregate.
+
+To use one, set `sort_order_tail_cache` on your Orderable subclass:
+
+    class Book(Orderable):
+        sort_order_tail_cache = LRUTailCache()
+
+Keys are tuples of the model's label and the list's `get_unique_fields()` values.
+A cached tail is only ever used to pick a new sort_order at the end of a list, so
+one that's too high just leaves a gap. The ordering code deletes the cached tail
+whenever it might have become too low.
+"""
+from collections import OrderedDict
+import threading
+
+from django.core.cache import caches
+
+
+class TailCache(object):
+    """The interface of a tail cache. Subclass this to add another backend."""
+    def get(self, key):
+        """Return the cached tail of `key`'s list, or None."""
+        raise NotImplementedError
+
+    def set(self, key, sort_order):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+
+class LRUTailCache(TailCache):
+    """
+    Keep the most recently used `maxsize` tails in process memory.
+
+    Only use this if a single process writes to the lists, as other processes
+    won't see its invalidations.
+    """
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._tails = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._tails.move_to_end(key)
+            except KeyError:
+                return None
+            return self._tails[key]
+
+    def set(self, key, sort_order):
+        with self._lock:
+            self._tails[key] = sort_order
+            self._tails.move_to_end(key)
+            if len(self._tails) > self.maxsize:
+                self._tails.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._tails.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._tails.clear()
+
+
+class DjangoTailCache(TailCache):
+    """Keep the tails in one of Django's caches, shared between processes."""
+    def __init__(self, alias='default', timeout=None, prefix='orderable'):
+        self.alias = alias
+        self.timeout = timeout
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return ':'.join([self.prefix] + [str(part) for part in key])
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def set(self, key, sort_order):
+        self.cache.set(self.make_key(key), sort_order, self.timeout)
+
+    def delete(self, key):
+        self.cache.delete(self.make_key(key))
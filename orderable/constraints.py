@@ -0,0 +1,29 @@
+from django.db.models import Deferrable, UniqueConstraint
+
+
+def deferred_sort_order_constraint(*fields, name=None):
+    """
+    Make `fields` and sort_order unique together, checked at the end of transactions.
+
+    Use this in `Meta.constraints` instead of `Meta.unique_together`. As the
+    constraint isn't checked part way through an UPDATE, Orderable can shift a list
+    with a single UPDATE, without lifting objects out of the way first. Only
+    PostgreSQL (and Oracle) support deferrable unique constraints.
+
+    Pass `name` to override the default constraint name.
+    """
+    if name is None:
+        name = '%(app_label)s_%(class)s_{}_sort_order_uniq'.format('_'.join(fields))
+    return UniqueConstraint(
+        fields=list(fields) + ['sort_order'],
+        name=name,
+        deferrable=Deferrable.DEFERRED,
+    )
+
+
+def is_deferred(constraint):
+    """Is `constraint` a UniqueConstraint checked at the end of transactions?"""
+    return (
+        isinstance(constraint, UniqueConstraint) and
+        constraint.deferrable == Deferrable.DEFERRED
+    )
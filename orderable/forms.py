@@ -0,0 +1,57 @@
+from django.forms.models import BaseInlineFormSet
+
+
+class OrderableInlineFormSet(BaseInlineFormSet):
+    """
+    An inline formset that applies all the submitted sort_orders in one go.
+
+    Saving each changed form on its own would shift the list once per form, over
+    the objects the earlier forms just moved. Instead, the other fields are saved
+    first, with each object's sort_order left alone, then the parent's objects are
+    rearranged in place like `OrderableQueryset.set_orders` does.
+
+    An object moved to a sort_order goes before the object that was already there,
+    as it would with save(). A blank sort_order moves the object to the end.
+    """
+    def save_existing_objects(self, commit=True):
+        self._sort_orders = {}
+        saved_instances = super(OrderableInlineFormSet, self).save_existing_objects(
+            commit=commit,
+        )
+        if self._sort_orders:
+            self._apply_sort_orders()
+        return saved_instances
+
+    def save_existing(self, form, obj, commit=True):
+        if commit and '_original_sort_order' in obj.__dict__:
+            self._sort_orders[obj.pk] = obj.sort_order
+            # Put the old value back, so save() doesn't shift the list.
+            obj._set_sort_order(obj.__dict__['_original_sort_order'])
+            if form.changed_data == ['sort_order']:
+                return obj
+        return super(OrderableInlineFormSet, self).save_existing(form, obj, commit)
+
+    def _apply_sort_orders(self):
+        """Rearrange the parent's objects into the submitted order."""
+        objects = self.model.objects.filter(**{self.fk.name: self.instance})
+        current = dict(objects.values_list('pk', 'sort_order'))
+
+        def position(pk):
+            sort_order = self._sort_orders.get(pk, current[pk])
+            if sort_order is None:
+                sort_order = float('inf')
+            return (sort_order, pk not in self._sort_orders, current[pk])
+
+        # As in set_orders(), reuse the sort_orders the objects already have.
+        object_pks = sorted(current, key=position)
+        new_orders = dict(zip(object_pks, sorted(current.values())))
+        changed = [
+            (pk, order) for pk, order in new_orders.items() if current[pk] != order
+        ]
+        if changed:
+            objects._apply_orders(changed, batch_size=1000)
+
+        # Keep the saved objects in step with the database.
+        for form in self.initial_forms:
+            if form.instance.pk in self._sort_orders:
+                form.instance._set_sort_order(new_orders[form.instance.pk])
@@ -0,0 +1,15 @@
+from django.db.models import Index
+
+
+def sort_order_index(*fields, name=None):
+    """
+    Index `fields` and sort_order together, in that order.
+
+    Use this in `Meta.indexes` to serve the filter on a list plus the sort_order
+    range or MAX() that Orderable runs on every insert, move and next()/prev().
+    Not needed if `fields` and sort_order are already in a unique_together or an
+    unconditional UniqueConstraint.
+
+    Django names the index if `name` isn't given.
+    """
+    return Index(fields=list(fields) + ['sort_order'], name=name or '')
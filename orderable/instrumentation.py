@@ -0,0 +1,206 @@
+"""
+Measure ordering operations, and report them with the `ordering_operation` signal.
+
+Each operation (save(), delete(), the move methods, and the queryset's set_orders(),
+renumber(), bulk_append(), bulk_insert_at() and delete()) sends one signal when it
+finishes, counting the SQL statements it ran and the rows it shifted. Operations
+that call each other are reported once, as the outermost one. When nothing is
+connected to the signal, nothing is measured.
+
+To report to statsd or Prometheus, connect one of the reporters below:
+
+    StatsdReporter(statsd_client).connect()
+
+To check operations in tests, use a `MemoryCollector`:
+
+    with MemoryCollector() as collector:
+        book.move_to(3)
+    collector.events[0]['rows']
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+import time
+
+from django.db import connections, models, router
+
+from .signals import ordering_operation
+
+
+_current = ContextVar('orderable_operation', default=None)
+
+
+class Operation(object):
+    """The running totals of one ordering operation."""
+    def __init__(self, operation, group):
+        self.operation = operation
+        self.group = group
+        self.rows = 0
+        self.queries = 0
+        self.retries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count each statement, as a database execute_wrapper."""
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def measure(model, operation, get_group):
+    """
+    Measure the block as `operation` on `model`, then send `ordering_operation`.
+
+    `get_group` is called for the list's key only if the signal has receivers.
+    Nested blocks count towards the outermost one.
+    """
+    if _current.get() is not None or not ordering_operation.has_listeners(model):
+        yield
+        return
+
+    record = Operation(operation, get_group())
+    token = _current.set(record)
+    start = time.perf_counter()
+    try:
+        with connections[router.db_for_write(model)].execute_wrapper(record):
+            yield
+    finally:
+        _current.reset(token)
+    ordering_operation.send(
+        sender=model,
+        operation=record.operation,
+        group=record.group,
+        rows=record.rows,
+        queries=record.queries,
+        retries=record.retries,
+        duration=time.perf_counter() - start,
+    )
+
+
+def instrumented(method):
+    """Measure an Orderable or OrderableQueryset method. See `measure`."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if isinstance(self, models.QuerySet):
+            model, get_group = self.model, lambda: None
+        else:
+            model = self.__class__
+            get_group = lambda: model._get_list_key(self._get_group())  # noqa: E731
+        with measure(model, method.__name__, get_group):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def add_rows(count):
+    """Count `count` rows shifted by the current operation, if it's measured."""
+    record = _current.get()
+    if record is not None:
+        record.rows += count
+
+
+def add_retry():
+    """Count a retry by the current operation, if it's measured."""
+    record = _current.get()
+    if record is not None:
+        record.retries += 1
+
+
+class Reporter(object):
+    """
+    Receive `ordering_operation`. Subclass this and override `report`.
+
+    Reporters are connected with a strong reference, so `disconnect` them when
+    they're done with.
+    """
+    def __init__(self, sender=None):
+        self.sender = sender
+
+    def connect(self):
+        ordering_operation.connect(
+            self.receive, sender=self.sender, weak=False, dispatch_uid=id(self),
+        )
+        return self
+
+    def disconnect(self):
+        ordering_operation.disconnect(sender=self.sender, dispatch_uid=id(self))
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc_info):
+        self.disconnect()
+
+    def receive(self, sender, signal=None, **event):
+        self.report(sender, **event)
+
+    def report(self, model, operation, group, rows, queries, retries, duration):
+        raise NotImplementedError
+
+
+class MemoryCollector(Reporter):
+    """Keep every event in `events`, a list of dicts, e.g. for tests."""
+    def __init__(self, sender=None):
+        super(MemoryCollector, self).__init__(sender)
+        self.events = []
+
+    def report(self, model, **event):
+        event['model'] = model
+        self.events.append(event)
+
+    def clear(self):
+        self.events = []
+
+
+class StatsdReporter(Reporter):
+    """
+    Send each event to a statsd client, such as `statsd.StatsClient`.
+
+    Times `<prefix>.<app_label>.<model>.<operation>` in milliseconds, and increments
+    the `.rows`, `.queries` and `.retries` counters under it.
+    """
+    def __init__(self, client, prefix='orderable', sender=None):
+        super(StatsdReporter, self).__init__(sender)
+        self.client = client
+        self.prefix = prefix
+
+    def report(self, model, operation, group, rows, queries, retries, duration):
+        name = '{}.{}.{}'.format(self.prefix, model._meta.label_lower, operation)
+        self.client.timing(name, duration * 1000)
+        self.client.incr(name + '.rows', rows)
+        self.client.incr(name + '.queries', queries)
+        if retries:
+            self.client.incr(name + '.retries', retries)
+
+
+class PrometheusReporter(Reporter):
+    """
+    Record each event in Prometheus metrics, labelled with the model and operation.
+
+    Needs `prometheus_client`. The metrics are registered in `registry` (by default
+    the global one), so only make one reporter per registry.
+    """
+    def __init__(self, registry=None, namespace='orderable', sender=None):
+        from prometheus_client import Counter, Histogram, REGISTRY
+
+        super(PrometheusReporter, self).__init__(sender)
+        registry = REGISTRY if registry is None else registry
+        labels = ['model', 'operation']
+        options = {'namespace': namespace, 'registry': registry}
+        self.duration = Histogram(
+            'operation_seconds', 'Time taken by ordering operations.', labels, **options
+        )
+        self.rows = Counter(
+            'rows_shifted', 'Rows shifted by ordering operations.', labels, **options
+        )
+        self.queries = Counter(
+            'queries', 'Queries run by ordering operations.', labels, **options
+        )
+        self.retries = Counter(
+            'retries', 'Retries taken by ordering operations.', labels, **options
+        )
+
+    def report(self, model, operation, group, rows, queries, retries, duration):
+        labels = (model._meta.label_lower, operation)
+        self.duration.labels(*labels).observe(duration)
+        self.rows.labels(*labels).inc(rows)
+        self.queries.labels(*labels).inc(queries)
+        self.retries.labels(*labels).inc(retries)
@@ -0,0 +1,53 @@
+"""
+Locks that serialise appends and moves within a list.
+
+Without a lock, `Orderable.save()` retries once when a concurrent write makes it
+clash with a unique constraint. To serialise writes instead, set `sort_order_lock`
+on your Orderable subclass:
+
+    class Chapter(Orderable):
+        sort_order_lock = AdvisoryLock()
+
+Locks are taken inside a transaction and held until it ends.
+"""
+import hashlib
+
+from django.db import connections
+
+
+class ListLock(object):
+    """The interface of a list lock. Subclass this to add another strategy."""
+    def acquire(self, objects, key):
+        """
+        Lock the list `objects` until the end of the current transaction.
+
+        `key` identifies the list: the model's label followed by the values of
+        its `get_unique_fields()`.
+        """
+        raise NotImplementedError
+
+
+class NoLock(ListLock):
+    """Don't lock anything, e.g. on SQLite where writes are serialised anyway."""
+    def acquire(self, objects, key):
+        pass
+
+
+class SelectForUpdateLock(ListLock):
+    """
+    Lock every row in the list with SELECT ... FOR UPDATE.
+
+    Rows are locked in pk order, so two writers can't deadlock. An empty list has no
+    rows to lock, so the first appends to it aren't serialised.
+    """
+    def acquire(self, objects, key):
+        list(objects.select_for_update().order_by('pk').values_list('pk', flat=True))
+
+
+class AdvisoryLock(ListLock):
+    """Take a PostgreSQL transaction-level advisory lock on a hash of the list key."""
+    def acquire(self, objects, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).digest()
+        lock_id = int.from_bytes(digest[:8], 'big', signed=True)
+        with connections[objects.db].cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [lock_id])
@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Orderable
+from ...querysets import OrderableQueryset
+
+
+class Command(BaseCommand):
+    help = (
+        'Renumber the sort_order of Orderable models, closing gaps and separating '
+        'duplicates, while keeping the current order.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.ModelName',
+            help='The models to renumber. Defaults to every Orderable model.',
+        )
+        parser.add_argument(
+            '--start', type=int,
+            help="The first sort_order of each list. Defaults to the step.",
+        )
+        parser.add_argument(
+            '--step', type=int,
+            help="The step between sort_orders. Defaults to the model's gap, or 1.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=(
+                'Write this many objects per query, rather than all of them in one '
+                'query.'
+            ),
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Count the objects that would be renumbered, without writing them.',
+        )
+
+    def handle(self, **options):
+        for model in self.get_models(options['models']):
+            # Renumber the whole table, whatever the default manager filters out.
+            count = OrderableQueryset(model).renumber(
+                start=options['start'],
+                step=options['step'],
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+            message = '{}: {} objects {}renumbered.'.format(
+                model._meta.label, count, 'would be ' if options['dry_run'] else '',
+            )
+            self.stdout.write(message)
+
+    def get_models(self, labels):
+        if not labels:
+            return [
+                model for model in apps.get_models() if issubclass(model, Orderable)
+            ]
+
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            if not issubclass(model, Orderable):
+                raise CommandError('{} is not an Orderable model.'.format(label))
+            models.append(model)
+        return models
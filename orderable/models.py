@@ -1,25 +1,61 @@
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.core import checks
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError, models, transaction
+from django.db.models.signals import class_prepared
 from django.utils.html import format_html
 
+from .constraints import is_deferred
+from .instrumentation import add_retry, add_rows, instrumented
 from .managers import OrderableManager
 
+# Values that can't be changed in place, so are only changed by setting the field.
+IMMUTABLE_TYPES = (type(None), bool, int, float, Decimal, str, bytes, date, time,
+                   timedelta, UUID)
+
 
 class Orderable(models.Model):
     """
     An orderable object that keeps all the instances in an enforced order.
 
-    If there's a unique_together which includes the sort_order field then that
-    will be used when checking for collisions etc.
+    If there's a unique_together (or UniqueConstraint) which includes the sort_order
+    field then that will be used when checking for collisions etc.
 
     This works well for inlines, which can be manually reordered by entering
     numbers, and the save function will prevent against collisions.
 
     For main objects, you would want to also use "OrderableAdmin", which will
-    make a nice jquery admin interface.
+    make a nice drag-and-drop admin interface.
+
+    Set `sort_order_partition` to a tuple of field names to keep a separate order
+    for each combination of their values, without a unique constraint.
+
+    Set `sort_order_gap` (e.g. to 1024) to space the sort_order values out, so that
+    inserting or moving an object only writes that object. The group is renumbered
+    when there's no gap left at the target position.
+
+    Set `sort_order_tail_cache` to one of the caches in `orderable.cache` to skip
+    the aggregate query that finds the end of the list on every append.
+
+    Set `sort_order_lock` to one of the locks in `orderable.locks` to serialise
+    appends and moves within each list, rather than retrying on IntegrityError.
+
+    Set `sort_order_close_gaps` to shift the objects after a deleted object down,
+    keeping sort_order contiguous. It has no effect with `sort_order_gap`.
     """
     sort_order = models.IntegerField(blank=True, db_index=True)
 
+    sort_order_partition = None
+    sort_order_gap = None
+    sort_order_tail_cache = None
+    sort_order_lock = None
+    sort_order_close_gaps = False
+
     objects = OrderableManager()
 
     class Meta:
@@ -27,130 +63,747 @@ class Orderable(models.Model):
         ordering = ['sort_order']
 
     def get_unique_fields(self):
-        """List field names that are unique_together with `sort_order`."""
-        for unique_together in self._meta.unique_together:
-            if 'sort_order' in unique_together:
-                unique_fields = list(unique_together)
-                unique_fields.remove('sort_order')
-                return ['%s_id' % f for f in unique_fields]
-        return []
+        """List the attnames of the fields that partition objects into lists."""
+        return self._get_group_fields()
+
+    @classmethod
+    def _get_group_fields(cls):
+        return list(cls._sort_order_group_fields)
+
+    @classmethod
+    def _prepare_sort_order(cls):
+        """
+        Work out which fields sort_order is unique with, once per model class.
+
+        __setattr__ runs for every field of every object loaded, so it can't afford
+        to walk `_meta` each time.
+        """
+        opts = cls._meta
+        constraints = [
+            c for c in opts.constraints
+            if isinstance(c, models.UniqueConstraint) and 'sort_order' in c.fields
+        ]
+        deferred = [c.fields for c in constraints if is_deferred(c)]
+        unique = [
+            fields for fields in opts.unique_together if 'sort_order' in fields
+        ] + [c.fields for c in constraints if not is_deferred(c)]
+
+        if cls.sort_order_partition is not None:
+            partition = cls.sort_order_partition
+        else:
+            # Conditional constraints partition the table just the same.
+            partition = next(iter(unique + deferred), ())
+        group_fields = tuple(
+            opts.get_field(f).attname for f in partition if f != 'sort_order'
+        )
+
+        cls._sort_order_group_fields = group_fields
+        cls._sort_order_tracked_fields = frozenset(('sort_order',) + group_fields)
+        fields = [f for f in opts.concrete_fields if not f.primary_key]
+        cls._sort_order_other_fields = frozenset(
+            f.attname for f in fields
+        ) - cls._sort_order_tracked_fields
+        cls._sort_order_moved_fields = cls._sort_order_tracked_fields | frozenset(
+            f.attname for f in fields if getattr(f, 'auto_now', False)
+        )
+        cls._sort_order_unique_together = any(
+            len(fields) > 1 for fields in unique + deferred
+        )
+        cls._sort_order_unique = opts.get_field('sort_order').unique or bool(unique)
+        cls._sort_order_deferred = bool(deferred)
 
     def get_filtered_manager(self):
         manager = self.__class__.objects
-        kwargs = {field: getattr(self, field) for field in self.get_unique_fields()}
+        kwargs = {field: getattr(self, field) for field in self._sort_order_group_fields}
         return manager.filter(**kwargs)
 
     def next(self):
         if not self.sort_order:
             return None
 
+        if 'next_pk' in self.__dict__:
+            return self._get_neighbour(self.next_pk)
         return self.get_filtered_manager().after(self)
 
     def prev(self):
         if not self.sort_order:
             return None
 
+        if 'prev_pk' in self.__dict__:
+            return self._get_neighbour(self.prev_pk)
         return self.get_filtered_manager().before(self)
 
+    def _get_neighbour(self, pk):
+        """Get a neighbour annotated by `OrderableQueryset.with_neighbours`."""
+        if pk is None:
+            return None
+        return self.__class__.objects.filter(pk=pk).first()
+
+    async def anext_item(self):
+        """Async version of `next()`."""
+        if not self.sort_order:
+            return None
+
+        if 'next_pk' in self.__dict__:
+            return await self._aget_neighbour(self.next_pk)
+        return await self.get_filtered_manager().aafter(self)
+
+    async def aprev_item(self):
+        """Async version of `prev()`."""
+        if not self.sort_order:
+            return None
+
+        if 'prev_pk' in self.__dict__:
+            return await self._aget_neighbour(self.prev_pk)
+        return await self.get_filtered_manager().abefore(self)
+
+    async def _aget_neighbour(self, pk):
+        if pk is None:
+            return None
+        return await self.__class__.objects.filter(pk=pk).afirst()
+
+    @instrumented
+    def move_to(self, sort_order):
+        """
+        Move self to `sort_order`, shifting the objects in between out of the way.
+
+        Unlike setting `sort_order` and calling save(), only sort_order columns are
+        written. Returns a queryset of the objects whose sort_order changed.
+        """
+        objects = self.get_filtered_manager()
+        with self._lock_list(objects, self._get_group()):
+            positions = self._get_positions(objects)
+            after = sort_order > positions['current']
+            return self._move(objects, positions, sort_order, after)
+
+    @instrumented
+    def move_above(self, other):
+        """Move self to just before `other`. See `move_to`."""
+        objects = self.get_filtered_manager()
+        with self._lock_list(objects, self._get_group()):
+            positions = self._get_positions(objects, other)
+            target = positions['other']
+            if not self.sort_order_gap and positions['current'] < target:
+                target -= 1
+            return self._move(objects, positions, target, after=False)
+
+    @instrumented
+    def move_below(self, other):
+        """Move self to just after `other`. See `move_to`."""
+        objects = self.get_filtered_manager()
+        with self._lock_list(objects, self._get_group()):
+            positions = self._get_positions(objects, other)
+            target = positions['other']
+            if not self.sort_order_gap and positions['current'] > target:
+                target += 1
+            return self._move(objects, positions, target, after=True)
+
+    @instrumented
+    def to_top(self):
+        """Move self to the start of the list. See `move_to`."""
+        objects = self.get_filtered_manager()
+        with self._lock_list(objects, self._get_group()):
+            positions = self._get_positions(objects)
+            return self._move(objects, positions, positions['first'], after=False)
+
+    @instrumented
+    def to_bottom(self):
+        """Move self to the end of the list. See `move_to`."""
+        objects = self.get_filtered_manager()
+        with self._lock_list(objects, self._get_group()):
+            positions = self._get_positions(objects)
+            return self._move(objects, positions, positions['end'], after=True)
+
+    @instrumented
+    def swap(self, other):
+        """
+        Swap places with `other`, leaving everything else where it is.
+
+        Returns a queryset of self and other.
+        """
+        objects = self.get_filtered_manager()
+        with self._lock_list(objects, self._get_group()):
+            positions = self._get_positions(objects, other)
+            objects._apply_orders(
+                [(self.pk, positions['other']), (other.pk, positions['current'])],
+                batch_size=2,
+            )
+            self._set_sort_order(positions['other'])
+            other._set_sort_order(positions['current'])
+            return objects.filter(pk__in=[self.pk, other.pk])
+
+    # Async versions of the move methods. Each runs in a single sync_to_async() call,
+    # so its transaction (and list lock) holds a thread for one call, not one per
+    # query. asave() is Django's, which wraps save() in the same way.
+
+    async def amove_to(self, sort_order):
+        return await sync_to_async(self.move_to)(sort_order)
+
+    async def amove_above(self, other):
+        return await sync_to_async(self.move_above)(other)
+
+    async def amove_below(self, other):
+        return await sync_to_async(self.move_below)(other)
+
+    async def ato_top(self):
+        return await sync_to_async(self.to_top)()
+
+    async def ato_bottom(self):
+        return await sync_to_async(self.to_bottom)()
+
+    async def aswap(self, other):
+        return await sync_to_async(self.swap)(other)
+
+    def _get_positions(self, objects, other=None):
+        """Get the current sort_orders of self (and other) and the list's ends."""
+        aggregates = {
+            'current': models.Max('sort_order', filter=models.Q(pk=self.pk)),
+            'first': models.Min('sort_order'),
+            'end': models.Max('sort_order'),
+        }
+        if other is not None:
+            aggregates['other'] = models.Max('sort_order', filter=models.Q(pk=other.pk))
+        positions = objects.aggregate(**aggregates)
+
+        if positions['current'] is None:
+            raise ValueError('{!r} is not saved in this list.'.format(self))
+        if other is not None and positions['other'] is None:
+            raise ValueError('{!r} is not in the same list as {!r}.'.format(other, self))
+        return positions
+
+    def _move(self, objects, positions, target, after):
+        """Move self from its current sort_order to `target` with queryset updates."""
+        current = positions['current']
+        if target == current:
+            return objects.none()
+
+        with transaction.atomic():
+            if self.sort_order_gap:
+                sort_order, renumbered = self._get_free_sort_order(objects, target, after)
+                self._write_sort_order(sort_order)
+                self._clear_tail()
+                return objects.all() if renumbered else objects.filter(pk=self.pk)
+
+            self._clear_tail()
+            to_shift = objects.exclude(pk=self.pk)
+            if self._is_sort_order_unique():
+                # Park self at the end, out of the way of the shifted objects.
+                self._write_sort_order(positions['end'] + 1)
+
+            if target < current:
+                to_shift = to_shift.filter(sort_order__gte=target, sort_order__lt=current)
+                self._shift(to_shift, objects, 1)
+                changed = objects.filter(sort_order__gte=target, sort_order__lte=current)
+            else:
+                to_shift = to_shift.filter(sort_order__lte=target, sort_order__gt=current)
+                self._shift(to_shift, objects, -1)
+                changed = objects.filter(sort_order__gte=current, sort_order__lte=target)
+
+            self._write_sort_order(target)
+        return changed
+
+    def _get_group(self):
+        """Get the values of the fields that are unique_together with sort_order."""
+        return tuple(getattr(self, field) for field in self._sort_order_group_fields)
+
+    @classmethod
+    def _get_list_key(cls, group):
+        return (cls._meta.label_lower,) + tuple(group)
+
+    def _write_sort_order(self, sort_order):
+        """Write only the sort_order column of self."""
+        self.__class__._base_manager.filter(pk=self.pk).update(sort_order=sort_order)
+        self._set_sort_order(sort_order)
+
+    def _set_sort_order(self, sort_order):
+        """Set sort_order to a value that's already saved, skipping change tracking."""
+        self.__dict__['sort_order'] = sort_order
+        self.__dict__.pop('_original_sort_order', None)
+        self._clear_neighbours()
+
+    def _clear_neighbours(self):
+        """Forget the `with_neighbours` annotations, now self has moved."""
+        for attr in ('prev_pk', 'next_pk', 'sort_rank'):
+            self.__dict__.pop(attr, None)
+
     def validate_unique(self, exclude=None):
         if self._is_sort_order_unique_together_with_something():
-            exclude = exclude or []
-            if 'sort_order' not in exclude:
-                exclude.append('sort_order')
+            exclude = set(exclude or ())
+            exclude.add('sort_order')
         return super(Orderable, self).validate_unique(exclude=exclude)
 
+    def _get_unique_checks(self, exclude=None, *args, **kwargs):
+        # Model formsets check unique_together across their forms with this, but
+        # clashing sort_orders are sorted out when they're saved.
+        if self._is_sort_order_unique_together_with_something():
+            exclude = set(exclude or ())
+            exclude.add('sort_order')
+        return super(Orderable, self)._get_unique_checks(exclude, *args, **kwargs)
+
+    def validate_constraints(self, exclude=None):
+        if self._is_sort_order_unique_together_with_something():
+            exclude = set(exclude or ())
+            exclude.add('sort_order')
+        return super(Orderable, self).validate_constraints(exclude=exclude)
+
+    @classmethod
+    def check(cls, **kwargs):
+        errors = super(Orderable, cls).check(**kwargs)
+        if not cls._meta.abstract:
+            errors.extend(cls._check_sort_order_index())
+            errors.extend(cls._check_deferred_sort_order())
+        return errors
+
+    @classmethod
+    def _check_sort_order_index(cls):
+        group_fields = set(cls._sort_order_group_fields)
+        if not group_fields:
+            # The index on sort_order alone is enough.
+            return []
+
+        size = len(group_fields)
+        for columns in cls._get_indexed_columns():
+            leading, rest = columns[:size], columns[size:]
+            if set(leading) == group_fields and rest[:1] == ['sort_order']:
+                return []
+        return [
+            checks.Warning(
+                'No index covers the list fields followed by sort_order, so shifts and '
+                'finding the end of a list may scan the whole list.',
+                hint="Add orderable.indexes.sort_order_index({}) to Meta.indexes.".format(
+                    ', '.join(repr(f) for f in cls._get_partition_names())
+                ),
+                obj=cls,
+                id='orderable.W001',
+            ),
+        ]
+
+    @classmethod
+    def _get_partition_names(cls):
+        """Get the field names (rather than attnames) of the group fields."""
+        attnames = {f.attname: f.name for f in cls._meta.concrete_fields}
+        return [attnames[attname] for attname in cls._sort_order_group_fields]
+
+    @classmethod
+    def _get_indexed_columns(cls):
+        """List the attnames covered by each full index, in index order."""
+        opts = cls._meta
+        indexes = list(opts.unique_together) + [
+            index.fields for index in opts.indexes if index.condition is None
+        ] + [
+            c.fields for c in opts.constraints
+            if isinstance(c, models.UniqueConstraint) and c.condition is None
+        ]
+        return [
+            [opts.get_field(f.lstrip('-')).attname for f in fields]
+            for fields in indexes
+        ]
+
+    @classmethod
+    def _check_deferred_sort_order(cls):
+        if not cls._is_sort_order_deferred():
+            return []
+        if not cls._is_sort_order_unique():
+            return []
+        return [
+            checks.Warning(
+                'sort_order has a deferred unique constraint, but is also unique '
+                'without deferral, so lists are still shifted one object at a time.',
+                hint='Remove sort_order from unique_together (or unique=True).',
+                obj=cls,
+                id='orderable.W002',
+            ),
+        ]
+
     def _is_sort_order_unique_together_with_something(self):
         """
         Is the sort_order field unique_together with something
         """
-        unique_together = self._meta.unique_together
-        for fields in unique_together:
-            if 'sort_order' in fields and len(fields) > 1:
-                return True
-        return False
+        return self._sort_order_unique_together
+
+    @classmethod
+    def _is_sort_order_unique(cls):
+        """
+        Can two objects clash on sort_order part way through an UPDATE?
+
+        Deferred unique constraints are only checked at the end of the transaction,
+        so they don't count.
+        """
+        return cls._sort_order_unique
+
+    @classmethod
+    def _is_sort_order_deferred(cls):
+        """Is sort_order in a deferred unique constraint?"""
+        return cls._sort_order_deferred
+
+    @classmethod
+    @contextmanager
+    def _lock_list(cls, objects, group):
+        """Hold `sort_order_lock` on a list (if set) until the end of the block."""
+        if cls.sort_order_lock is None:
+            yield
+            return
+
+        with transaction.atomic():
+            cls.sort_order_lock.acquire(objects, cls._get_list_key(group))
+            yield
+
+    @classmethod
+    def _shift(cls, qs, objects, by):
+        """
+        Add `by` to the sort_order of a queryset within the list `objects`.
+
+        If sort_order isn't unique (or its constraint is deferred), nothing can clash
+        part way through, so this is a single UPDATE. If the list is locked, lift the
+        queryset clear of the rest of the list and drop it back down, so it takes two
+        UPDATEs however the rows are visited. Otherwise see `_update`.
+        """
+        if not cls._is_sort_order_unique():
+            add_rows(qs.update(sort_order=models.F('sort_order') + by))
+        elif cls.sort_order_lock is not None:
+            end = objects.aggregate(models.Max('sort_order'))['sort_order__max']
+            if end is None:
+                return
+            add_rows(qs.update(sort_order=models.F('sort_order') + (end + 1 + by)))
+            objects.filter(sort_order__gt=end).update(
+                sort_order=models.F('sort_order') - (end + 1),
+            )
+        else:
+            add_rows(cls._update(qs, by))
 
     @staticmethod
-    def _update(qs):
+    def _update(qs, by=1):
         """
-        Increment the sort_order in a queryset.
+        Increment the sort_order in a queryset (by `by`).
 
-        Handle IntegrityErrors caused by unique constraints.
+        Handle IntegrityErrors caused by unique constraints. Returns the number of
+        objects updated.
         """
         try:
             with transaction.atomic():
-                qs.update(sort_order=models.F('sort_order') + 1)
+                return qs.update(sort_order=models.F('sort_order') + by)
         except IntegrityError:
-            for obj in qs.order_by('-sort_order'):
-                qs.filter(pk=obj.pk).update(sort_order=models.F('sort_order') + 1)
+            add_retry()
+            # Move the objects on the leading edge out of the way first.
+            count = 0
+            for obj in qs.order_by('-sort_order' if by > 0 else 'sort_order'):
+                obj_qs = qs.filter(pk=obj.pk)
+                count += obj_qs.update(sort_order=models.F('sort_order') + by)
+            return count
 
     def _save(self, objects, old_pos, new_pos):
         """WARNING: Intensive giggery-pokery zone."""
+        if self.sort_order_gap:
+            return self._save_gapped(objects, old_pos, new_pos)
+
         to_shift = objects.exclude(pk=self.pk) if self.pk else objects
 
         # If not set, insert at end.
         if self.sort_order is None:
             self._move_to_end(objects)
 
-        # New insert.
-        elif not self.pk and not old_pos:
+        # New insert, or moved into another list.
+        elif not old_pos and (not self.pk or self._unique_togethers_changed()):
             # Increment `sort_order` on objects with:
             #     sort_order > new_pos.
             to_shift = to_shift.filter(sort_order__gte=self.sort_order)
-            self._update(to_shift)
+            self._shift(to_shift, objects, 1)
             self.sort_order = new_pos
 
         # self.sort_order decreased.
         elif old_pos and new_pos < old_pos:
-            self._move_to_end(objects)
-            super(Orderable, self).save()
+            self._park(objects)
             # Increment `sort_order` on objects with:
             #     sort_order >= new_pos and sort_order < old_pos
             to_shift = to_shift.filter(sort_order__gte=new_pos, sort_order__lt=old_pos)
-            self._update(to_shift)
+            self._shift(to_shift, objects, 1)
             self.sort_order = new_pos
 
         # self.sort_order increased.
         elif old_pos and new_pos > old_pos:
-            self._move_to_end(objects)
-            super(Orderable, self).save()
+            self._park(objects)
             # Decrement sort_order on objects with:
             #     sort_order <= new_pos and sort_order > old_pos.
             to_shift = to_shift.filter(sort_order__lte=new_pos, sort_order__gt=old_pos)
-            to_shift.update(sort_order=models.F('sort_order') - 1)
+            self._shift(to_shift, objects, -1)
             self.sort_order = new_pos
 
+    def _park(self, objects):
+        """
+        Save self at the end, out of the way of the objects it's moving past.
+
+        Only sort_order and the list fields are written; save() writes the rest.
+        """
+        if self._is_sort_order_unique():
+            self._move_to_end(objects)
+            group_fields = self._sort_order_group_fields
+            values = {field: getattr(self, field) for field in group_fields}
+            self.__class__._base_manager.filter(pk=self.pk).update(
+                sort_order=self.sort_order, **values
+            )
+
+    def _save_gapped(self, objects, old_pos, new_pos):
+        """Find a free `sort_order` for self without shifting anything else."""
+        if self.sort_order is None:
+            self._move_to_end(objects)
+            return
+
+        moved = old_pos is not None and new_pos != old_pos
+        if self.pk and not moved:
+            return
+
+        after = moved and new_pos > old_pos
+        self.sort_order, renumbered = self._get_free_sort_order(objects, new_pos, after)
+
+    def _get_free_sort_order(self, objects, sort_order, after):
+        """
+        Get `sort_order` if it's free, or else a free one just before/after it.
+
+        Moving down the list lands just after the object at sort_order, anything else
+        lands just before it. Also return whether the list had to be renumbered.
+        """
+        others = objects.exclude(pk=self.pk) if self.pk else objects
+        occupants = others.filter(sort_order=sort_order).values_list('pk', flat=True)
+        occupant = occupants.first()
+        if occupant is None:
+            return sort_order, False
+
+        slot = self._get_gap_slot(others, sort_order, after)
+        if slot is not None:
+            return slot, False
+
+        # No gap left, so space the list out and look again.
+        objects.renumber()
+        sort_order = others.values_list('sort_order', flat=True).get(pk=occupant)
+        return self._get_gap_slot(others, sort_order, after), True
+
+    def _get_gap_slot(self, others, sort_order, after):
+        """
+        Get a free sort_order just before or after `sort_order`.
+
+        Return None if there's no gap left there.
+        """
+        if after:
+            lower = sort_order
+            upper = others.filter(sort_order__gt=sort_order).aggregate(
+                models.Min('sort_order'))['sort_order__min']
+            if upper is None:
+                return sort_order + self.sort_order_gap
+        else:
+            lower = others.filter(sort_order__lt=sort_order).aggregate(
+                models.Max('sort_order'))['sort_order__max'] or 0
+            upper = sort_order
+        if upper - lower < 2:
+            return None
+        return (lower + upper) // 2
+
     def _move_to_end(self, objects):
         """Temporarily save `self.sort_order` elsewhere (max_obj)."""
-        max_obj = objects.all().aggregate(models.Max('sort_order'))['sort_order__max']
-        self.sort_order = max_obj + 1 if max_obj else 1
+        max_obj = self._get_tail(objects)
+        self.sort_order = (max_obj or 0) + (self.sort_order_gap or 1)
+
+    def _get_tail(self, objects):
+        """Get the highest sort_order in the list, from the tail cache if possible."""
+        cache = self.sort_order_tail_cache
+        if cache is not None:
+            key = self._get_list_key(self._get_group())
+            tail = cache.get(key)
+            if tail is not None:
+                return tail
+
+        tail = objects.all().aggregate(models.Max('sort_order'))['sort_order__max']
+        if cache is not None and tail is not None:
+            cache.set(key, tail)
+        return tail
+
+    def _set_tail(self):
+        """Cache self.sort_order as the end of the list after an append."""
+        if self.sort_order_tail_cache is not None:
+            key = self._get_list_key(self._get_group())
+            self.sort_order_tail_cache.set(key, self.sort_order)
+
+    def _clear_tail(self):
+        """Forget the cached end of the list, as it may have moved."""
+        if self.sort_order_tail_cache is not None:
+            key = self._get_list_key(self._get_group())
+            self.sort_order_tail_cache.delete(key)
 
     def _unique_togethers_changed(self):
-        for field in self.get_unique_fields():
+        for field in self._sort_order_group_fields:
             if getattr(self, '_original_%s' % field, False):
                 return True
         return False
 
+    @instrumented
     def save(self, *args, **kwargs):
-        """Keep the unique order in sync."""
+        """
+        Keep the unique order in sync.
+
+        Saving an existing object that hasn't moved (or with `update_fields` that
+        leave out sort_order and the list fields) doesn't touch the order, so it's
+        just the UPDATE. Otherwise sort_order is added to any `update_fields`.
+        """
+        update_fields = kwargs.get('update_fields')
+        if not self._writes_order(update_fields):
+            return super(Orderable, self).save(*args, **kwargs)
+
         objects = self.get_filtered_manager()
         old_pos = getattr(self, '_original_sort_order', None)
         new_pos = self.sort_order
 
-        if old_pos is None and self._unique_togethers_changed():
-            self.sort_order = None
-            new_pos = None
+        changed_list = self._unique_togethers_changed()
+        if changed_list:
+            # Self is inserted into the new list, at the end unless sort_order moved.
+            if old_pos is None:
+                self.sort_order = None
+                new_pos = None
+            old_pos = None
+        appending = new_pos is None
+        adding = self._state.adding
+
+        if not adding and not appending and not changed_list and old_pos is None:
+            super(Orderable, self).save(*args, **kwargs)
+            self._clear_original(update_fields)
+            return
+        fields = self._get_update_fields(update_fields, old_pos)
+        if fields is not None:
+            kwargs['update_fields'] = fields
+
+        if self.sort_order_lock is not None:
+            old_pos = self._save_locked(objects, old_pos, new_pos, *args, **kwargs)
+        elif self._is_sort_order_deferred():
+            # The shift leaves another object at self's sort_order until self is
+            # saved, so both have to be in the transaction the constraint checks.
+            with transaction.atomic():
+                self._save(objects, old_pos, new_pos)
+                super(Orderable, self).save(*args, **kwargs)
+        else:
+            old_pos = self._save_with_retry(objects, old_pos, new_pos)
+            # Call the "real" save() method.
+            super(Orderable, self).save(*args, **kwargs)
+
+        self._clear_original(update_fields)
+        self._clear_neighbours()
+        if appending:
+            self._set_tail()
+        elif adding or changed_list or old_pos is not None:
+            self._clear_tail()
+
+    def _save_locked(self, objects, old_pos, new_pos, *args, **kwargs):
+        """
+        Run `_save` and save self, holding `sort_order_lock` on self's lists.
 
+        Both the list self is leaving and the one it's joining are locked. Returns
+        the old sort_order that was used.
+        """
+        groups = {self._get_original_group(), self._get_group()}
+        with transaction.atomic():
+            self.__class__.objects.all()._lock_lists(self._get_group_fields(), groups)
+            if old_pos is not None:
+                # Another writer may have moved self since it was loaded.
+                old_pos = self._get_saved_sort_order()
+            self._save(objects, old_pos, new_pos)
+            # Call the "real" save() method while the lists are still locked.
+            super(Orderable, self).save(*args, **kwargs)
+        return old_pos
+
+    def _get_original_group(self):
+        """Get the values of the list fields before any changes since the last save."""
+        return tuple(
+            self.__dict__.get('_original_%s' % field, getattr(self, field))
+            for field in self._sort_order_group_fields
+        )
+
+    def _get_saved_sort_order(self):
+        return self.__class__._base_manager.filter(pk=self.pk).values_list(
+            'sort_order', flat=True)[0]
+
+    def _save_with_retry(self, objects, old_pos, new_pos):
+        """
+        Run `_save`, retrying once from the saved sort_order if a write clashes.
+
+        Returns the old sort_order that was used.
+        """
         try:
             with transaction.atomic():
                 self._save(objects, old_pos, new_pos)
         except IntegrityError:
+            add_retry()
             with transaction.atomic():
-                old_pos = objects.filter(pk=self.pk).values_list(
-                    'sort_order', flat=True)[0]
+                if old_pos is not None:
+                    old_pos = self._get_saved_sort_order()
                 self._save(objects, old_pos, new_pos)
+        return old_pos
+
+    def _get_update_fields(self, update_fields, old_pos):
+        """
+        Get the `update_fields` for save() to write self with once it's been moved.
+
+        Moving self along a unique list parks it first, which writes sort_order and
+        the list fields. If nothing else can have changed, the final UPDATE writes
+        just those (and any auto_now fields) rather than the whole row again.
+        """
+        if update_fields is not None:
+            return set(update_fields) | {'sort_order'}
+        parked = self._is_sort_order_unique() and not self.sort_order_gap
+        if old_pos is None or not parked or self._other_fields_changed():
+            return None
+        return set(self._sort_order_moved_fields)
+
+    def _other_fields_changed(self):
+        """
+        Whether any field but sort_order and the list fields may have changed.
+
+        __setattr__ flags fields set to new values, and deferred fields that are set
+        at all. Mutable values (a JSONField's dict, say) could have been changed in
+        place, so they count as changed.
+        """
+        if self.__dict__.get('_sort_order_other_changed'):
+            return True
+        return not all(
+            isinstance(self.__dict__.get(field), IMMUTABLE_TYPES)
+            for field in self._sort_order_other_fields
+        )
+
+    @classmethod
+    def _writes_order(cls, update_fields):
+        """Whether `update_fields` includes sort_order or any of the list fields."""
+        if update_fields is None:
+            return True
+        written = {cls._meta.get_field(name).attname for name in update_fields}
+        return bool(written & cls._sort_order_tracked_fields)
+
+    def _clear_original(self, update_fields=None):
+        """
+        Forget the values saved by `__setattr__`, now they've been written.
 
-        # Call the "real" save() method.
-        super(Orderable, self).save(*args, **kwargs)
+        Other fields have only all been written if there were no `update_fields`.
+        """
+        for field in self._sort_order_tracked_fields:
+            self.__dict__.pop('_original_%s' % field, None)
+        if update_fields is None:
+            self.__dict__.pop('_sort_order_other_changed', None)
+
+    @instrumented
+    def delete(self, *args, **kwargs):
+        if not self._closes_gaps():
+            return super(Orderable, self).delete(*args, **kwargs)
+
+        objects = self.get_filtered_manager()
+        # Close the gap at the saved sort_order, even if it's been changed since.
+        sort_order = self.__dict__.get('_original_sort_order')
+        if sort_order is None:
+            sort_order = self.sort_order
+        with self._lock_list(objects, self._get_group()):
+            with transaction.atomic():
+                deleted = super(Orderable, self).delete(*args, **kwargs)
+                objects._close_gaps([sort_order])
+        self._clear_tail()
+        return deleted
+
+    @classmethod
+    def _closes_gaps(cls):
+        return cls.sort_order_close_gaps and not cls.sort_order_gap
 
     def sort_order_display(self):
         return format_html(
@@ -166,11 +819,12 @@ class Orderable(models.Model):
         """
         Cache original value of `sort_order` when a change is made to it.
 
-        Also cache values of other unique together fields.
+        Also cache values of other unique together fields, and flag changes to any
+        other field.
 
         Greatly inspired by http://code.google.com/p/django-audit/
         """
-        if attr == 'sort_order' or attr in self.get_unique_fields():
+        if attr in self._sort_order_tracked_fields:
             try:
                 current = self.__dict__[attr]
             except (AttributeError, KeyError, ObjectDoesNotExist):
@@ -179,4 +833,21 @@ class Orderable(models.Model):
                 previously_set = getattr(self, '_original_%s' % attr, False)
                 if current != value and not previously_set:
                     setattr(self, '_original_%s' % attr, current)
+        elif attr in self._sort_order_other_fields:
+            if attr in self.__dict__:
+                changed = self.__dict__[attr] != value
+            else:
+                # A deferred field, unless the fields are still being set by __init__.
+                state = self.__dict__.get('_state')
+                changed = state is not None and not state.adding
+            if changed:
+                self.__dict__['_sort_order_other_changed'] = True
         super(Orderable, self).__setattr__(attr, value)
+
+
+def _prepare_orderable(sender, **kwargs):
+    if issubclass(sender, Orderable):
+        sender._prepare_sort_order()
+
+
+class_prepared.connect(_prepare_orderable)
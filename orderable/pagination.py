@@ -0,0 +1,119 @@
+"""
+Paginate ordered lists by seeking past the last object seen, rather than OFFSET.
+
+A page starts just after (or ends just before) the key of an object: the values
+of its group fields, sort_order and pk. Any page costs an index seek on those
+fields (see `orderable.indexes.sort_order_index`) however deep it is, and pages
+don't skip or repeat objects when others are inserted or deleted in between.
+
+    paginator = KeysetPaginator(Book.objects.all(), per_page=50)
+    page = paginator.page()
+    page = paginator.page(after=page.next_key)
+"""
+from django.db.models import Q
+
+
+class KeysetPage(object):
+    """One page of objects, with the keys to fetch the pages either side."""
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<KeysetPage of {} objects>'.format(len(self))
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    @property
+    def next_key(self):
+        """Pass as `after` to get the next page, or None if this is the last page."""
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.get_key(self.object_list[-1])
+
+    @property
+    def previous_key(self):
+        """Pass as `before` to get the previous page, or None if this is the first."""
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.get_key(self.object_list[0])
+
+
+class KeysetPaginator(object):
+    """
+    Paginate an OrderableQueryset `per_page` objects at a time, list by list.
+
+    Objects are ordered like `OrderableQueryset.iter_ordered`. Pages are fetched
+    with `page()`, by the key of the object just before or after them.
+    """
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.key_fields = queryset._get_ordering_key()
+
+    def get_key(self, obj):
+        """Get the key of an object: its group field values, sort_order and pk."""
+        return tuple(getattr(obj, field) for field in self.key_fields)
+
+    def page(self, after=None, before=None):
+        """
+        Get the page just after the `after` key, or just before the `before` key.
+
+        Either key may also be an object. With neither, get the first page.
+        """
+        if after is not None and before is not None:
+            raise ValueError('Pass only one of `after` and `before`.')
+
+        objects = self.queryset
+        key = after if before is None else before
+        if key is not None:
+            if not isinstance(key, (tuple, list)):
+                key = self.get_key(key)
+            objects = objects.filter(self._seek(key, forwards=before is None))
+
+        if before is None:
+            ordering = self.key_fields
+        else:
+            ordering = ['-' + field for field in self.key_fields]
+        object_list = list(objects.order_by(*ordering)[:self.per_page + 1])
+        more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+
+        if before is None:
+            return KeysetPage(self, object_list, more, after is not None)
+        return KeysetPage(self, object_list[::-1], True, more)
+
+    def _seek(self, key, forwards):
+        """
+        Filter for the objects past `key`, comparing the key fields in order.
+
+        The leading field is also compared on its own, so the database can seek an
+        index to the first object rather than filtering every row.
+        """
+        if len(key) != len(self.key_fields):
+            raise ValueError('Expected a key of {}.'.format(', '.join(self.key_fields)))
+
+        past = 'gt' if forwards else 'lt'
+        seek = Q()
+        equal = {}
+        for field, value in zip(self.key_fields, key):
+            seek |= Q(**dict(equal, **{'{}__{}'.format(field, past): value}))
+            equal[field] = value
+        first_field, first_value = self.key_fields[0], key[0]
+        leading = Q(**{'{}__{}e'.format(first_field, past): first_value})
+        return leading & seek
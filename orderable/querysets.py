@@ -1,4 +1,9 @@
-from django.db import models, transaction
+from asgiref.sync import sync_to_async
+from django.db import connections, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Lag, Lead, RowNumber
+
+from .instrumentation import add_rows, instrumented
 
 
 class OrderableQueryset(models.QuerySet):
@@ -15,7 +20,91 @@ class OrderableQueryset(models.QuerySet):
     def after(self, orderable):
         return self.filter(sort_order__gt=orderable.sort_order).first()
 
-    def set_orders(self, object_pks):
+    async def abefore(self, orderable):
+        return await self.filter(sort_order__lt=orderable.sort_order).alast()
+
+    async def aafter(self, orderable):
+        return await self.filter(sort_order__gt=orderable.sort_order).afirst()
+
+    def with_neighbours(self, rank=False):
+        """
+        Annotate each object with the pks of the objects either side of it.
+
+        Adds `prev_pk` and `next_pk` (and `sort_rank`, counting from 1, if `rank` is
+        set) using window functions, so no extra queries are needed. `next()` and
+        `prev()` use these annotations when they're present.
+
+        Window functions only see the rows left by the queryset's filters, including
+        those added after this, so `with_neighbours().get(pk=pk)` has no neighbours.
+        Fetch the list and pick objects out of it to keep their neighbours.
+        """
+        partition_by = [models.F(field) for field in self.model._get_group_fields()]
+        order_by = [models.F('sort_order').asc(), models.F('pk').asc()]
+
+        def window(expression):
+            return models.Window(
+                expression, partition_by=partition_by or None, order_by=order_by,
+            )
+
+        annotations = {'prev_pk': window(Lag('pk')), 'next_pk': window(Lead('pk'))}
+        if rank:
+            annotations['sort_rank'] = window(RowNumber())
+        return self.annotate(**annotations)
+
+    def iter_ordered(self, chunk_size=2000):
+        """
+        Iterate over the objects list by list, in order, without caching them.
+
+        Objects are ordered by their group fields (see `Orderable.get_unique_fields`),
+        sort_order and pk, and fetched `chunk_size` at a time. On databases with
+        server-side cursors, such as PostgreSQL, this holds one chunk in memory at
+        a time however long the lists are.
+        """
+        return self.order_by(*self._get_ordering_key()).iterator(chunk_size=chunk_size)
+
+    def at(self, position):
+        """
+        Get the object at `position` (counting from 1) in its list. See `range`.
+
+        Raises DoesNotExist if there's no such object, and MultipleObjectsReturned if
+        self holds more than one list with an object there.
+        """
+        return self.range(position, position + 1).get()
+
+    def range(self, start, stop):
+        """
+        Get the objects from `start` up to (not including) `stop` in each list.
+
+        Positions count from 1, in sort_order then pk order, so gaps and duplicate
+        sort_orders don't matter. The objects are ranked with `ROW_NUMBER()` in self
+        as filtered so far, and annotated with `sort_rank` (see `with_neighbours`).
+
+        Every object in self is ranked before filtering on the rank, so each call is
+        O(size of self), not an index seek. Filtering on a window needs Django 4.2.
+        """
+        ranked = self.with_neighbours(rank=True)
+        return ranked.filter(sort_rank__gte=start, sort_rank__lt=stop)
+
+    def position_of(self, obj):
+        """
+        Get the position (counting from 1) of `obj` in its list. See `range`.
+
+        Counts the objects before obj in its list, an index range scan rather than
+        ranking the whole list, so it's O(position). Raises DoesNotExist if obj isn't
+        in self.
+        """
+        sort_order = self.filter(pk=obj.pk).values_list('sort_order', flat=True).get()
+        group_fields = self.model._get_group_fields()
+        objects = self.filter(**{field: getattr(obj, field) for field in group_fields})
+        before = Q(sort_order__lt=sort_order) | Q(sort_order=sort_order, pk__lt=obj.pk)
+        return objects.filter(before).count() + 1
+
+    def _get_ordering_key(self):
+        """List the fields that order objects list by list: the group, sort_order, pk."""
+        return self.model._get_group_fields() + ['sort_order', 'pk']
+
+    @instrumented
+    def set_orders(self, object_pks, batch_size=1000):
         """
         Perform a mass update of sort_orders across the full queryset.
         Accepts a list, object_pks, of the intended order for the objects.
@@ -24,39 +113,519 @@ class OrderableQueryset(models.QuerySet):
         - Compile a list of all sort orders in the queryset. Leave out anything that
           isn't in the object_pks list - this deals with pagination and any
           inconsistencies.
-        - Get the maximum among all model object sort orders. Update the queryset to add
-          it to all the existing sort order values. This lifts them 'out of the way' of
+        - Work out which objects end up with a different sort order. Objects that are
+          already in the right place aren't written at all.
+        - If sort_order is unique (alone or together with something), get the maximum
+          sort order in the lists the objects belong to. Update the changed objects to
+          add it to their existing sort order values. This lifts them 'out of the way' of
           unique_together clashes when setting the intended sort orders.
-        - Set the sort order on each object. Use only sort_order values that the objects
-          had before calling this method, so they get rearranged in place.
-        Performs O(n) queries.
+        - Set the sort order on each changed object. Use only sort_order values that
+          the objects had before calling this method, so they get rearranged in place.
+        Performs a constant number of queries per `batch_size` changed objects.
         """
         objects_to_sort = self.filter(pk__in=object_pks)
-        max_value = self.model.objects.all().aggregate(
-            models.Max('sort_order')
-        )['sort_order__max']
 
-        # Call list() on the values right away, so they don't get affected by the
+        # Call dict() on the values right away, so they don't get affected by the
         # update() later (since values_list() is lazy).
-        orders = list(objects_to_sort.values_list('sort_order', flat=True))
+        current = dict(objects_to_sort.values_list('pk', 'sort_order'))
 
         # Check there are no unrecognised entries in the object_pks list. If so,
         # throw an error. We only have to check that they're the same length because
-        # orders is built using only entries in object_pks, and all the pks are unique,
-        # so if their lengths are the same, the elements must match up exactly.
-        if len(orders) != len(object_pks):
-            pks = set(objects_to_sort.values_list('pk', flat=True))
+        # current is built using only entries in object_pks, and all the pks are
+        # unique, so if their lengths are the same, the elements must match up exactly.
+        to_python = self.model._meta.pk.to_python
+        if len(current) != len(object_pks):
             message = 'The following object_pks are not in this queryset: {}'.format(
-                [pk for pk in object_pks if pk not in pks]
+                [pk for pk in object_pks if to_python(pk) not in current]
             )
             raise TypeError(message)
 
-        with transaction.atomic():
-            objects_to_sort.update(sort_order=models.F('sort_order') + max_value)
-            for pk, order in zip(object_pks, orders):
-                # Use update() to save a query per item and dodge the insertion sort
-                # code in save().
-                self.filter(pk=pk).update(sort_order=order)
+        orders = sorted(current.values())
+        changed = [
+            (pk, order) for pk, order in zip(object_pks, orders)
+            if current[to_python(pk)] != order
+        ]
+        if not changed:
+            return objects_to_sort
+
+        self._apply_orders(changed, batch_size)
 
         # Return the operated-on queryset for convenience.
         return objects_to_sort
+
+    @instrumented
+    def delete(self):
+        """
+        Delete the objects, closing the gaps they leave if the model asks for it.
+
+        With `Orderable.sort_order_close_gaps` set, the objects after the deleted ones
+        are shifted down with one UPDATE per list (two if sort_order is unique),
+        however many objects are deleted.
+        """
+        if not self.model._closes_gaps():
+            return super(OrderableQueryset, self).delete()
+
+        group_fields = self.model._get_group_fields()
+        with transaction.atomic():
+            positions = {}
+            for row in self.values_list(*group_fields + ['sort_order']):
+                positions.setdefault(row[:-1], []).append(row[-1])
+            self._lock_lists(group_fields, positions)
+
+            deleted = super(OrderableQueryset, self).delete()
+            for group, group_positions in positions.items():
+                objects = self.model.objects.filter(**dict(zip(group_fields, group)))
+                objects._close_gaps(group_positions)
+
+        self._clear_tails(positions)
+        return deleted
+
+    # Like QuerySet.delete(), keep this off the manager, so objects.delete() can't
+    # delete every row by accident.
+    delete.queryset_only = True
+    delete.alters_data = True
+
+    def _close_gaps(self, positions):
+        """
+        Shift the objects in the list self down over the deleted `positions`.
+
+        Each object moves down by the number of positions below it, in one UPDATE.
+        If sort_order is unique, the objects are lifted clear of the list first and
+        dropped back into place with a second UPDATE.
+        """
+        positions = sorted({position for position in positions if position is not None})
+        if not positions:
+            return
+
+        whens = [
+            models.When(sort_order__gt=position, then=models.F('sort_order') - (i + 1))
+            for i, position in reversed(list(enumerate(positions)))
+        ]
+        new_orders = models.Case(*whens, output_field=models.IntegerField())
+        to_shift = self.filter(sort_order__gt=positions[0])
+
+        if not self.model._is_sort_order_unique():
+            add_rows(to_shift.update(sort_order=new_orders))
+            return
+
+        end = self.aggregate(models.Max('sort_order'))['sort_order__max']
+        if end is None or end < positions[0]:
+            return
+        # Every new sort_order is at least positions[0], so this clears the list.
+        lift = end + 1 - positions[0]
+        add_rows(to_shift.update(sort_order=new_orders + lift))
+        self.filter(sort_order__gt=end).update(sort_order=models.F('sort_order') - lift)
+
+    async def aset_orders(self, object_pks, batch_size=1000):
+        """
+        Async version of `set_orders`.
+
+        The whole update runs in a single sync_to_async() call, so it holds a thread
+        for one call rather than one per query.
+        """
+        return await sync_to_async(self.set_orders)(object_pks, batch_size=batch_size)
+
+    @instrumented
+    def bulk_append(self, objs, batch_size=None):
+        """
+        Insert `objs` at the end of their lists with a single bulk_create().
+
+        The end of every list is read in one query, rather than once per object like
+        save() does. Any sort_order already set on `objs` is overwritten.
+        """
+        return self._bulk_insert(objs, None, batch_size)
+
+    @instrumented
+    def bulk_insert_at(self, objs, position, batch_size=None):
+        """
+        Insert `objs` from sort_order `position` onwards with a single bulk_create().
+
+        The objects already at or after `position` are shifted out of the way with one
+        UPDATE per list. Any sort_order already set on `objs` is overwritten.
+        """
+        return self._bulk_insert(objs, position, batch_size)
+
+    def _bulk_insert(self, objs, position, batch_size):
+        objs = list(objs)
+        group_fields = self.model._get_group_fields()
+        groups = {}
+        for obj in objs:
+            key = tuple(getattr(obj, field) for field in group_fields)
+            groups.setdefault(key, []).append(obj)
+
+        step = self.model.sort_order_gap or 1
+        with transaction.atomic():
+            self._lock_lists(group_fields, groups)
+            if position is None:
+                ends = self._get_ends(group_fields, groups)
+            for key, group in groups.items():
+                if position is None:
+                    start = (ends.get(key) or 0) + step
+                else:
+                    start = position
+                    objects = self.model.objects.filter(**dict(zip(group_fields, key)))
+                    to_shift = objects.filter(sort_order__gte=position)
+                    self.model._shift(to_shift, objects, len(group) * step)
+                for i, obj in enumerate(group):
+                    obj.sort_order = start + i * step
+            objs = self.bulk_create(objs, batch_size=batch_size)
+        # The objects are saved where they are, so a later save() mustn't move them.
+        for obj in objs:
+            obj._clear_original()
+
+        cache = self.model.sort_order_tail_cache
+        if cache is not None:
+            for key, group in groups.items():
+                if position is None:
+                    cache.set(self.model._get_list_key(key), group[-1].sort_order)
+                else:
+                    cache.delete(self.model._get_list_key(key))
+        return objs
+
+    @instrumented
+    def move_to_group(self, target, position=None, keep_relative_order=True,
+                      batch_size=1000):
+        """
+        Move the objects into the list `target`, at sort_order `position`.
+
+        `target` is a dict of the group fields (see `Orderable.get_unique_fields`)
+        and their values, or just the value if there's one group field, e.g. a
+        parent object. With no `position` the objects are appended.
+
+        With `keep_relative_order` the objects keep their order, list by list,
+        otherwise they're placed in the order of self. Unless the model has a
+        `sort_order_gap`, the gaps they leave in their lists are closed. This takes
+        a few queries per list, plus one UPDATE per `batch_size` objects. Returns a
+        queryset of the moved objects.
+        """
+        group_fields = self.model._get_group_fields()
+        target = self._get_group_values(target)
+        target_key = tuple(target[field] for field in group_fields)
+        step = self.model.sort_order_gap or 1
+
+        with transaction.atomic():
+            moving = self
+            if keep_relative_order:
+                moving = moving.order_by(*self._get_ordering_key())
+            rows = list(moving.values_list('pk', *group_fields + ['sort_order']))
+            if not rows:
+                return self.none()
+            positions = {}
+            for row in rows:
+                positions.setdefault(row[1:-1], []).append(row[-1])
+            self._lock_lists(group_fields, set(positions) | {target_key})
+
+            lists = Q()
+            for key in set(positions) | {target_key}:
+                lists |= Q(**dict(zip(group_fields, key)))
+            objects = self.model.objects.filter(lists)
+            # Park the objects below every sort_order in the lists, so that closing
+            # the gaps and opening a new one doesn't touch them.
+            low = min(objects.aggregate(models.Min('sort_order'))['sort_order__min'], 0)
+            pks = [row[0] for row in rows]
+            parked = [(pk, low - 1 - i) for i, pk in enumerate(pks)]
+            self._bulk_set_orders(parked, batch_size)
+
+            if not self.model.sort_order_gap:
+                for key, key_positions in positions.items():
+                    source = self.model.objects.filter(**dict(zip(group_fields, key)))
+                    source._close_gaps(key_positions)
+
+            destination = self.model.objects.filter(**target)
+            if position is None:
+                end = destination.filter(sort_order__gte=low).aggregate(
+                    models.Max('sort_order'))['sort_order__max']
+                position = (end or 0) + step
+            else:
+                to_shift = destination.filter(sort_order__gte=position)
+                self.model._shift(to_shift, destination, len(pks) * step)
+
+            orders = [(pk, position + i * step) for i, pk in enumerate(pks)]
+            self._bulk_set_orders(orders, batch_size, **target)
+
+        self._clear_tails(set(positions) | {target_key})
+        return self.model.objects.filter(pk__in=pks)
+
+    def _get_group_values(self, target):
+        """Get a dict of the group field attnames and their values in `target`."""
+        opts = self.model._meta
+        group_fields = self.model._get_group_fields()
+        if not group_fields:
+            raise ValueError('{} objects are all in one list.'.format(opts.label))
+        if not isinstance(target, dict):
+            if len(group_fields) > 1:
+                raise ValueError('Pass a dict of {}.'.format(', '.join(group_fields)))
+            target = {group_fields[0]: target}
+
+        values = {}
+        for name, value in target.items():
+            field = opts.get_field(name)
+            if isinstance(value, models.Model) and field.is_relation:
+                value = getattr(value, field.target_field.attname)
+            values[field.attname] = value
+        if set(values) != set(group_fields):
+            raise ValueError('Pass a dict of {}.'.format(', '.join(group_fields)))
+        return values
+
+    def _lock_lists(self, group_fields, groups):
+        """Take the model's `sort_order_lock` (if set) on each of `groups`."""
+        lock = self.model.sort_order_lock
+        if lock is None:
+            return
+
+        # Always lock lists in the same order, so two writers can't deadlock.
+        for key in sorted(groups, key=repr):
+            objects = self.model.objects.filter(**dict(zip(group_fields, key)))
+            lock.acquire(objects, self.model._get_list_key(key))
+
+    def _get_ends(self, group_fields, groups):
+        """Get the highest sort_order of each of `groups` in one query."""
+        objects = self.model.objects.order_by()
+        if not group_fields:
+            end = objects.aggregate(models.Max('sort_order'))['sort_order__max']
+            return {(): end}
+
+        lists = Q()
+        for key in groups:
+            lists |= Q(**dict(zip(group_fields, key)))
+        ends = objects.filter(lists).values_list(*group_fields).annotate(
+            end=models.Max('sort_order'),
+        )
+        return {row[:-1]: row[-1] for row in ends}
+
+    @instrumented
+    def renumber(self, start=None, step=None, batch_size=None, dry_run=False):
+        """
+        Rewrite the sort_orders as `start`, `start + step`, ... keeping the current order.
+
+        Each group of objects (see `Orderable.get_unique_fields`) is numbered on its
+        own, ordered by sort_order then pk, which also separates duplicates. `step`
+        defaults to the model's `sort_order_gap` (or 1) and `start` defaults to
+        `step`. Only objects whose sort_order changes are written.
+
+        Where the database supports `UPDATE ... FROM` (PostgreSQL and SQLite 3.33+),
+        the new sort_orders are worked out with `ROW_NUMBER()` and written in a single
+        UPDATE (two if sort_order is unique). Otherwise, or if `batch_size` is given,
+        the objects are read in order and written `batch_size` at a time.
+
+        Nothing is written if `dry_run` is set. Returns the number of objects
+        renumbered (or that would be).
+        """
+        step = step or self.model.sort_order_gap or 1
+        start = step if start is None else start
+        if batch_size is None and self._can_update_from():
+            count = self._renumber_in_database(start, step, dry_run)
+            if not dry_run:
+                add_rows(count)
+        else:
+            count = self._renumber_in_batches(start, step, batch_size or 1000, dry_run)
+
+        if count and not dry_run:
+            self._clear_tails(self._get_groups())
+        return count
+
+    def _can_update_from(self):
+        connection = connections[self.db]
+        if connection.vendor == 'postgresql':
+            return True
+        if connection.vendor == 'sqlite':
+            return connection.Database.sqlite_version_info >= (3, 33)
+        return False
+
+    def _renumber_in_database(self, start, step, dry_run):
+        """Renumber with ROW_NUMBER() in an UPDATE ... FROM. See `renumber`."""
+        partition_by = [models.F(field) for field in self.model._get_group_fields()]
+        row_number = models.Window(
+            RowNumber(),
+            partition_by=partition_by or None,
+            order_by=[models.F('sort_order').asc(), models.F('pk').asc()],
+        )
+        numbers = self.order_by().values(
+            renumber_pk=models.F('pk'),
+            renumber_old=models.F('sort_order'),
+            renumber_new=(row_number - 1) * step + start,
+        )
+        numbers_sql, numbers_params = numbers.query.sql_with_params()
+
+        connection = connections[self.db]
+        if dry_run:
+            sql = 'SELECT COUNT(*) FROM ({}) r WHERE r.renumber_old <> r.renumber_new'
+            with connection.cursor() as cursor:
+                cursor.execute(sql.format(numbers_sql), numbers_params)
+                return cursor.fetchone()[0]
+
+        opts = self.model._meta
+        qn = connection.ops.quote_name
+        sql = (
+            'UPDATE {table} SET {sort_order} = r.renumber_new + %s FROM ({numbers}) r '
+            'WHERE {table}.{pk} = r.renumber_pk AND r.renumber_old <> r.renumber_new'
+        ).format(
+            table=qn(opts.db_table),
+            sort_order=qn(opts.get_field('sort_order').column),
+            pk=qn(opts.pk.column),
+            numbers=numbers_sql,
+        )
+        if not self.model._is_sort_order_unique():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [0] + list(numbers_params))
+                return cursor.rowcount
+
+        with transaction.atomic(using=self.db):
+            # Write the new sort_orders above every current one first, then drop
+            # them into place, so they can't clash with each other on the way.
+            objects = self._get_lists()
+            end = objects.aggregate(models.Max('sort_order'))['sort_order__max']
+            if end is None:
+                return 0
+            lift = end + 1 - start
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [lift] + list(numbers_params))
+                count = cursor.rowcount
+            objects.filter(sort_order__gt=end).update(
+                sort_order=models.F('sort_order') - lift,
+            )
+        return count
+
+    def _renumber_in_batches(self, start, step, batch_size, dry_run):
+        """
+        Renumber list by list, reading `batch_size` objects at a time. See `renumber`.
+
+        Only one batch of objects (and the group values of each list) is held in
+        memory, and each UPDATE names at most `batch_size` objects.
+        """
+        group_fields = self.model._get_group_fields()
+        count = 0
+        for group in list(self._get_groups()):
+            values = dict(zip(group_fields, group))
+            objects = self.filter(**values)
+            count += objects._renumber_list(
+                self.model._base_manager.filter(**values), start, step, batch_size,
+                dry_run,
+            )
+        return count
+
+    def _renumber_list(self, objects, start, step, batch_size, dry_run):
+        """
+        Renumber self, the objects in self from the list `objects`.
+
+        Unless `dry_run` is set, self is lifted above every current and new sort_order
+        in the list with one UPDATE, in a transaction. The objects are then read back
+        in order and the changed ones written one UPDATE per batch, below the lifted
+        objects, so they can't clash or be read again. The rest are dropped back into
+        place with a final UPDATE.
+        """
+        if dry_run:
+            return self._renumber_batches(self, start, step, batch_size, 0, dry_run)
+
+        with transaction.atomic():
+            stats = self.aggregate(
+                first=models.Min('sort_order'), size=models.Count('pk'),
+            )
+            if not stats['size']:
+                return 0
+            end = objects.aggregate(models.Max('sort_order'))['sort_order__max']
+            top = max(end, start + (stats['size'] - 1) * step)
+            lift = top + 1 - stats['first']
+            self.update(sort_order=models.F('sort_order') + lift)
+            # Self's filters may not match the lifted objects, but they're the only
+            # objects in the list above `top`.
+            lifted = objects.filter(sort_order__gt=top)
+            count = self._renumber_batches(lifted, start, step, batch_size, lift, dry_run)
+            lifted.update(sort_order=models.F('sort_order') - lift)
+        return count
+
+    def _renumber_batches(self, objects, start, step, batch_size, lift, dry_run):
+        """
+        Read `objects` in order, seeking past the last object of each batch.
+
+        Objects are compared by their sort_order less `lift`. Unless `dry_run` is set,
+        the changed ones in each batch are written. Returns the number changed.
+        """
+        rows = objects.order_by('sort_order', 'pk').values_list('pk', 'sort_order')
+        count = 0
+        position = start
+        last = None
+        while True:
+            batch = rows
+            if last is not None:
+                pk, sort_order = last
+                batch = rows.filter(
+                    Q(sort_order__gt=sort_order) | Q(sort_order=sort_order, pk__gt=pk),
+                )
+            batch = list(batch[:batch_size])
+
+            changed = []
+            for pk, sort_order in batch:
+                if sort_order - lift != position:
+                    changed.append((pk, position))
+                position += step
+            if changed and not dry_run:
+                self._bulk_set_orders(changed, batch_size)
+            count += len(changed)
+
+            if len(batch) < batch_size:
+                return count
+            last = batch[-1]
+
+    def _get_lists(self):
+        """
+        Get all the objects in the same lists as the objects in self.
+
+        These include any the default manager leaves out, as they still hold their
+        sort_orders.
+        """
+        objects = self.model._base_manager.all()
+        for field in self.model._get_group_fields():
+            objects = objects.filter(**{field + '__in': self.values(field)})
+        return objects
+
+    def _get_groups(self):
+        """Get the values of the group fields of each list self has objects in."""
+        group_fields = self.model._get_group_fields()
+        if not group_fields:
+            return [()]
+        return self.order_by().values_list(*group_fields).distinct()
+
+    def _clear_tails(self, groups):
+        """Forget the cached end of each of `groups`."""
+        cache = self.model.sort_order_tail_cache
+        if cache is None:
+            return
+
+        for group in groups:
+            cache.delete(self.model._get_list_key(group))
+
+    def _apply_orders(self, orders, batch_size):
+        """
+        Write `orders`, a list of (pk, sort_order) pairs, in a transaction.
+
+        If sort_order is unique, lift the objects above every current and new
+        sort_order first, so they can't clash with each other on the way.
+        """
+        with transaction.atomic():
+            if self.model._is_sort_order_unique():
+                to_lift = self.filter(pk__in=[pk for pk, order in orders])
+                # Only the lists that the objects are in need to be cleared.
+                objects = to_lift._get_lists()
+                max_value = objects.aggregate(models.Max('sort_order'))['sort_order__max']
+                lift = max(max_value, max(order for pk, order in orders))
+                to_lift.update(sort_order=models.F('sort_order') + lift)
+            # Use update() to dodge the insertion sort code in save().
+            self._bulk_set_orders(orders, batch_size)
+
+    def _bulk_set_orders(self, orders, batch_size, **values):
+        """
+        Write `orders`, a list of (pk, sort_order) pairs, in one UPDATE per batch.
+
+        Each UPDATE uses a `CASE pk WHEN ... THEN ...` expression, so it doesn't run
+        the insertion sort code in save() and doesn't cost a query per object. Any
+        other field `values` are written too.
+        """
+        for start in range(0, len(orders), batch_size):
+            batch = orders[start:start + batch_size]
+            whens = [models.When(pk=pk, then=models.Value(order)) for pk, order in batch]
+            objects = self.model._base_manager.filter(pk__in=[pk for pk, order in batch])
+            add_rows(objects.update(
+                sort_order=models.Case(*whens, output_field=models.IntegerField()),
+                **values
+            ))
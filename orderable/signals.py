@@ -0,0 +1,12 @@
+from django.dispatch import Signal
+
+
+# Sent after each ordering operation on an Orderable, with the model as sender and:
+#     operation: the method's name, e.g. 'save', 'move_to' or 'set_orders'.
+#     group: the list's key (see `ListLock.acquire`), or None for queryset methods.
+#     rows: the number of other objects whose sort_order was shifted or rewritten.
+#     queries: the number of SQL statements run.
+#     retries: the number of times a clashing write was retried.
+#     duration: the time taken, in seconds.
+# See `orderable.instrumentation`.
+ordering_operation = Signal()
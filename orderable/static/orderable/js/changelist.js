@@ -0,0 +1,72 @@
+// Drag-and-drop reordering for OrderableAdmin's changelist.
+//
+// Each drop sends only the moved row and its new neighbour to the JSON
+// `reorder/move/` view, so reordering works on any page of a paginated list.
+import {makeSortable, showHandle} from './sortable.js';
+
+const config = document.getElementById('orderable-changelist').dataset;
+const body = document.querySelector('#changelist table tbody');
+
+function csrfToken() {
+    const input = document.querySelector('input[name=csrfmiddlewaretoken]');
+    if (input) {
+        return input.value;
+    }
+    const cookie = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    return cookie ? decodeURIComponent(cookie[1]) : '';
+}
+
+function pk(row) {
+    return row.id.replace(/^neworder_/, '');
+}
+
+function prepareRow(row) {
+    const sorthandle = row.querySelector('.sorthandle');
+    if (!sorthandle) {
+        return;
+    }
+    // Steal the drag handle's id, and keep the sort order so the server can
+    // tell if the row is stale.
+    row.id = sorthandle.id;
+    row.dataset.sortOrder = sorthandle.textContent.trim();
+    sorthandle.removeAttribute('id');
+    showHandle(sorthandle, config.dragHandle);
+}
+
+async function move(row) {
+    const data = {pk: pk(row), version: parseInt(row.dataset.sortOrder, 10)};
+    if (row.nextElementSibling) {
+        data.before = pk(row.nextElementSibling);
+    } else {
+        data.after = pk(row.previousElementSibling);
+    }
+
+    const response = await fetch(config.moveUrl, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: {'Content-Type': 'application/json', 'X-CSRFToken': csrfToken()},
+        body: JSON.stringify(data),
+    });
+    if (response.status === 409) {
+        // Someone else has reordered the list, so start again.
+        window.location.reload();
+        return;
+    }
+    if (!response.ok) {
+        return;
+    }
+
+    // Only the rows that moved are sent back.
+    const {orders} = await response.json();
+    for (const [key, sortOrder] of Object.entries(orders)) {
+        const moved = document.getElementById('neworder_' + key);
+        if (moved) {
+            moved.dataset.sortOrder = sortOrder;
+        }
+    }
+}
+
+if (body) {
+    body.querySelectorAll('tr').forEach(prepareRow);
+    makeSortable(body, {rows: 'tr[id^="neworder_"]', handle: '.sorthandletd', onDrop: move});
+}
@@ -0,0 +1,40 @@
+// Drag-and-drop reordering for OrderableTabularInline.
+//
+// The sort_order inputs are hidden, and rewritten on each drop with the values
+// they started with, so saving the form saves the new order.
+import {makeSortable, showHandle} from './sortable.js';
+
+function prepareInline(group) {
+    const body = group.querySelector('.tabular.inline-related tbody');
+    if (!body) {
+        return;
+    }
+    const rows = () => Array.from(body.querySelectorAll('tr.has_original'));
+    const input = (row) => row.querySelector('td.field-sort_order input');
+
+    const orders = [];
+    let minValue = 0;
+    rows().forEach((row) => {
+        const field = input(row);
+        // Ensure that the values increase.
+        const order = Math.max(minValue, parseInt(field.value, 10) || 0);
+        minValue = order + 1;
+        orders.push(order);
+
+        const sorthandle = document.createElement('span');
+        sorthandle.className = 'sorthandle';
+        field.parentNode.append(sorthandle);
+        field.style.display = 'none';
+        showHandle(sorthandle, group.dataset.dragHandle);
+    });
+
+    makeSortable(body, {
+        rows: 'tr.has_original',
+        handle: '.sorthandletd',
+        onDrop: () => rows().forEach((row, i) => {
+            input(row).value = orders[i];
+        }),
+    });
+}
+
+document.querySelectorAll('.orderable-inline').forEach(prepareInline);
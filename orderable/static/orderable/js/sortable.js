@@ -0,0 +1,74 @@
+// Drag-and-drop reordering of table rows with native HTML5 drag events.
+//
+// Rows are moved in the DOM as they're dragged over, so nothing needs measuring
+// up front. `onDrop(row)` is called once the drag ends, if the row moved.
+export function makeSortable(body, {rows, handle, onDrop}) {
+    let dragged = null;
+    let startIndex = null;
+
+    const allRows = () => Array.from(body.querySelectorAll(rows));
+
+    body.addEventListener('pointerdown', (event) => {
+        const row = event.target.closest(rows);
+        // Only drag from the handle, so the row's inputs stay usable.
+        if (row) {
+            row.draggable = Boolean(event.target.closest(handle));
+        }
+    });
+
+    body.addEventListener('dragstart', (event) => {
+        dragged = event.target.closest(rows);
+        if (!dragged) {
+            return;
+        }
+        startIndex = allRows().indexOf(dragged);
+        event.dataTransfer.effectAllowed = 'move';
+        // Firefox won't start a drag without some data.
+        event.dataTransfer.setData('text/plain', '');
+        dragged.classList.add('orderable-dragging');
+    });
+
+    body.addEventListener('dragover', (event) => {
+        if (!dragged) {
+            return;
+        }
+        event.preventDefault();
+        const row = event.target.closest(rows);
+        if (!row || row === dragged) {
+            return;
+        }
+        const box = row.getBoundingClientRect();
+        const below = event.clientY > box.top + box.height / 2;
+        row.parentNode.insertBefore(dragged, below ? row.nextSibling : row);
+    });
+
+    body.addEventListener('drop', (event) => {
+        if (dragged) {
+            event.preventDefault();
+        }
+    });
+
+    body.addEventListener('dragend', () => {
+        if (!dragged) {
+            return;
+        }
+        const row = dragged;
+        dragged = null;
+        row.classList.remove('orderable-dragging');
+        row.draggable = false;
+        if (allRows().indexOf(row) !== startIndex) {
+            onDrop(row);
+        }
+    });
+}
+
+// Replace a `.sorthandle`'s contents with the drag handle image.
+export function showHandle(sorthandle, src) {
+    const img = document.createElement('img');
+    img.src = src;
+    img.width = 11;
+    img.height = 11;
+    img.alt = 'Drag to reorder';
+    sorthandle.replaceChildren(img);
+    sorthandle.parentNode.classList.add('sorthandletd');
+}
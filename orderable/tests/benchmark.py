@@ -0,0 +1,229 @@
+"""
+Benchmark the ordering operations on lists of different lengths.
+
+Run from the repository root, against SQLite or a local PostgreSQL:
+
+    python orderable/tests/benchmark.py
+    python orderable/tests/benchmark.py --database postgres --sizes 100 1000 100000
+
+For each operation, this records the number of queries, the number of objects whose
+sort_order changed and the wall time. Pass `--json` to write the results to a file,
+e.g. to compare them between builds.
+"""
+from argparse import ArgumentParser
+import json
+import sys
+import time
+
+import django
+from django.conf import settings
+
+
+def append(models, lists):
+    models.Task.objects.create()
+
+
+def insert_first(models, lists):
+    models.Task.objects.create(sort_order=1)
+
+
+def move_up(models, lists):
+    task = models.Task.objects.last()
+    task.sort_order = 1
+    task.save()
+
+
+def move_down(models, lists):
+    task = models.Task.objects.first()
+    task.sort_order = lists['size']
+    task.save()
+
+
+def append_subtask(models, lists):
+    models.SubTask.objects.create(task=lists['task'])
+
+
+def insert_first_subtask(models, lists):
+    models.SubTask.objects.create(task=lists['task'], sort_order=1)
+
+
+def move_up_subtask(models, lists):
+    subtask = lists['task'].subtask_set.last()
+    subtask.sort_order = 1
+    subtask.save()
+
+
+def move_down_subtask(models, lists):
+    subtask = lists['task'].subtask_set.first()
+    subtask.sort_order = lists['size']
+    subtask.save()
+
+
+def change_group(models, lists):
+    subtask = lists['task'].subtask_set.first()
+    subtask.task = lists['other_task']
+    subtask.save()
+
+
+def move_to(models, lists):
+    lists['task'].subtask_set.last().move_to(1)
+
+
+def set_orders(models, lists):
+    subtasks = lists['task'].subtask_set.all()
+    subtasks.set_orders(list(subtasks.values_list('pk', flat=True))[::-1])
+
+
+def bulk_append(models, lists):
+    models.SubTask.objects.bulk_append(
+        [models.SubTask(task=lists['task']) for i in range(100)]
+    )
+
+
+OPERATIONS = [
+    append,
+    insert_first,
+    move_up,
+    move_down,
+    append_subtask,
+    insert_first_subtask,
+    move_up_subtask,
+    move_down_subtask,
+    change_group,
+    move_to,
+    set_orders,
+    bulk_append,
+]
+
+
+def seed(models, size):
+    """Create `size` Tasks, and two lists of `size` SubTasks."""
+    models.Task.objects.bulk_create(
+        [models.Task(sort_order=i) for i in range(1, size + 1)], batch_size=1000,
+    )
+    task, other_task = models.Task.objects.all()[:2]
+    for parent in [task, other_task]:
+        models.SubTask.objects.bulk_create(
+            [models.SubTask(task=parent, sort_order=i) for i in range(1, size + 1)],
+            batch_size=1000,
+        )
+    return {'size': size, 'task': task, 'other_task': other_task}
+
+
+def get_sort_orders(models):
+    sort_orders = {}
+    for model in [models.Task, models.SubTask]:
+        for pk, sort_order in model.objects.values_list('pk', 'sort_order'):
+            sort_orders[model, pk] = sort_order
+    return sort_orders
+
+
+class QueryCounter(object):
+    """Count queries without logging them, as there can be thousands."""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(models, operation, lists):
+    """Run `operation`, then roll back whatever it changed."""
+    from django.db import connection, transaction
+
+    queries = QueryCounter()
+    with transaction.atomic():
+        before = get_sort_orders(models)
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            operation(models, lists)
+            elapsed = time.perf_counter() - start
+        after = get_sort_orders(models)
+        transaction.set_rollback(True)
+
+    return {
+        'operation': operation.__name__,
+        'size': lists['size'],
+        'queries': queries.count,
+        'changed': sum(1 for key, value in after.items() if before.get(key) != value),
+        'ms': round(elapsed * 1000, 2),
+    }
+
+
+def run(sizes, operations=OPERATIONS):
+    """Benchmark each of `operations` on lists of each of `sizes`."""
+    from django.db import transaction
+    from orderable.tests import models
+
+    results = []
+    for size in sizes:
+        with transaction.atomic():
+            lists = seed(models, size)
+            for operation in operations:
+                results.append(measure(models, operation, lists))
+            transaction.set_rollback(True)
+    return results
+
+
+def configure(database, host):
+    if database == 'postgres':
+        databases = {'default': {
+            'ENGINE': 'django.db.backends.postgresql_psycopg2',
+            'NAME': 'orderable',
+            'HOST': host,
+        }}
+    else:
+        databases = {'default': {'ENGINE': 'django.db.backends.sqlite3'}}
+    settings.configure(
+        DATABASES=databases,
+        INSTALLED_APPS=(
+            'orderable',
+            'orderable.tests',
+        ),
+        DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+    )
+    django.setup()
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark the ordering operations.')
+    parser.add_argument(
+        '--database', choices=['sqlite', 'postgres'], default='sqlite',
+        help='The database to run against.')
+    parser.add_argument(
+        '--host', default='localhost',
+        help='The PostgreSQL host.')
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[100, 1000, 10000],
+        help='The lengths of list to benchmark.')
+    parser.add_argument(
+        '--json', metavar='FILE',
+        help='Also write the results to FILE as JSON.')
+    options = parser.parse_args()
+
+    configure(options.database, options.host)
+
+    from django.db import connection
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        results = run(options.sizes)
+    finally:
+        connection.creation.destroy_test_db(connection.settings_dict['NAME'], verbosity=0)
+
+    line = '{operation:<22} {size:>8} {queries:>8} {changed:>8} {ms:>10}'
+    print(line.format(
+        operation='operation', size='size', queries='queries', changed='changed',
+        ms='ms',
+    ))
+    for result in results:
+        print(line.format(**result))
+
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, '.')
+    main()
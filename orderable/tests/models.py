@@ -1,5 +1,10 @@
 from django.db import models
 
+from ..cache import LRUTailCache
+from ..constraints import deferred_sort_order_constraint
+from ..indexes import sort_order_index
+from ..locks import SelectForUpdateLock
+from ..managers import OrderableManager
 from ..models import Orderable
 
 
@@ -13,9 +18,123 @@ class Task(Orderable):
 class SubTask(Orderable):
     """An orderable model with unique_together."""
     task = models.ForeignKey('Task', models.CASCADE)
+    title = models.CharField(max_length=100, blank=True)
 
     class Meta(Orderable.Meta):
         unique_together = ('task', 'sort_order')
 
     def __str__(self):
         return 'SubTask {}'.format(self.pk)
+
+
+class GappedTask(Orderable):
+    """An orderable model with gaps between the sort_order values."""
+    sort_order_gap = 4
+
+    def __str__(self):
+        return 'GappedTask {}'.format(self.pk)
+
+
+class CachedSubTask(Orderable):
+    """An orderable model with unique_together and a tail cache."""
+    task = models.ForeignKey('Task', models.CASCADE)
+
+    sort_order_tail_cache = LRUTailCache(maxsize=2)
+
+    class Meta(Orderable.Meta):
+        unique_together = ('task', 'sort_order')
+
+    def __str__(self):
+        return 'CachedSubTask {}'.format(self.pk)
+
+
+class LockedSubTask(Orderable):
+    """An orderable model with unique_together and a list lock."""
+    task = models.ForeignKey('Task', models.CASCADE)
+
+    sort_order_lock = SelectForUpdateLock()
+
+    class Meta(Orderable.Meta):
+        unique_together = ('task', 'sort_order')
+
+    def __str__(self):
+        return 'LockedSubTask {}'.format(self.pk)
+
+
+class DeferredSubTask(Orderable):
+    """An orderable model with a deferred unique constraint."""
+    task = models.ForeignKey('Task', models.CASCADE)
+
+    class Meta(Orderable.Meta):
+        constraints = [deferred_sort_order_constraint('task')]
+
+    def __str__(self):
+        return 'DeferredSubTask {}'.format(self.pk)
+
+
+class ConstrainedSubTask(Orderable):
+    """An orderable model with a UniqueConstraint instead of unique_together."""
+    task = models.ForeignKey('Task', models.CASCADE)
+
+    class Meta(Orderable.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'sort_order'], name='constrained_subtask_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return 'ConstrainedSubTask {}'.format(self.pk)
+
+
+class PartitionedTask(Orderable):
+    """An orderable model ordered within each category, without a constraint."""
+    category = models.CharField(max_length=10)
+
+    sort_order_partition = ('category',)
+
+    class Meta(Orderable.Meta):
+        indexes = [sort_order_index('category')]
+
+    def __str__(self):
+        return 'PartitionedTask {}'.format(self.pk)
+
+
+class CompactTask(Orderable):
+    """An orderable model that closes the gaps left by deletes."""
+    sort_order_close_gaps = True
+
+    def __str__(self):
+        return 'CompactTask {}'.format(self.pk)
+
+
+class CompactSubTask(Orderable):
+    """An orderable model with unique_together that closes the gaps left by deletes."""
+    task = models.ForeignKey('Task', models.CASCADE)
+
+    sort_order_close_gaps = True
+
+    class Meta(Orderable.Meta):
+        unique_together = ('task', 'sort_order')
+
+    def __str__(self):
+        return 'CompactSubTask {}'.format(self.pk)
+
+
+class UnarchivedManager(OrderableManager):
+    def get_queryset(self):
+        return super(UnarchivedManager, self).get_queryset().filter(archived=False)
+
+
+class ArchivableSubTask(Orderable):
+    """An orderable model whose default manager leaves out archived objects."""
+    task = models.ForeignKey('Task', models.CASCADE)
+    archived = models.BooleanField(default=False)
+
+    objects = UnarchivedManager()
+
+    class Meta(Orderable.Meta):
+        unique_together = ('task', 'sort_order')
+
+    def __str__(self):
+        return 'ArchivableSubTask {}'.format(self.pk)
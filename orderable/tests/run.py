@@ -8,11 +8,15 @@ from django.test.runner import DiscoverRunner
 
 settings.configure(
     DATABASES={'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'django.db.backends.postgresql',
         'NAME': 'orderable',
         'HOST': 'localhost'
     }},
     INSTALLED_APPS=(
+        # hypothesis.extra.django imports django.contrib.auth.forms.
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'orderable',
         'orderable.tests',
     ),
     MIDDLEWARE_CLASSES=[],
@@ -1,8 +1,13 @@
+import json
+from unittest import mock
+
 from django.contrib.admin import AdminSite
-from django.test import TestCase
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 
-from orderable.admin import OrderableAdmin
-from orderable.tests.models import Task
+from orderable.admin import OrderableAdmin, OrderableTabularInline
+from orderable.tests.models import SubTask, Task
 
 
 class OrderableAdminTest(TestCase):
@@ -12,3 +17,187 @@ class OrderableAdminTest(TestCase):
 
         url_name = OrderableAdmin(Task, admin_site).get_url_name()
         self.assertEqual(url_name, expected_name)
+
+    def test_no_external_media(self):
+        """The drag-and-drop scripts are served locally, without jQuery UI."""
+        class SubTaskInline(OrderableTabularInline):
+            model = SubTask
+
+        admin_site = AdminSite()
+        admins = [
+            OrderableAdmin(Task, admin_site),
+            SubTaskInline(Task, admin_site),
+        ]
+
+        for model_admin in admins:
+            with self.subTest(model_admin=model_admin):
+                media = str(model_admin.media)
+                self.assertNotIn('//', media)
+                self.assertNotIn('jquery-ui', media)
+
+
+class ReorderViewTest(TestCase):
+    def setUp(self):
+        self.admin = OrderableAdmin(SubTask, AdminSite())
+        self.task = Task.objects.create()
+        self.items = [SubTask.objects.create(task=self.task) for i in range(4)]
+
+    def post(self, data):
+        request = RequestFactory().post('/reorder/', data)
+        request._dont_enforce_csrf_checks = True
+        with mock.patch.object(self.admin, 'has_change_permission', return_value=True):
+            return self.admin.reorder_view(request)
+
+    def assertOrder(self, expected):
+        self.assertSequenceEqual(self.task.subtask_set.all(), expected)
+
+    def test_move_before(self):
+        item1, item2, item3, item4 = self.items
+
+        response = self.post({'moved': item4.pk, 'before': item2.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertOrder([item1, item4, item2, item3])
+
+    def test_move_after(self):
+        """Dropping at the bottom of a page sends the object above it instead."""
+        item1, item2, item3, item4 = self.items
+
+        response = self.post({'moved': item1.pk, 'after': item3.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertOrder([item2, item3, item1, item4])
+
+    def test_move_only_writes_moved_range(self):
+        item1, item2, item3, item4 = self.items
+
+        self.post({'moved': item3.pk, 'before': item2.pk})
+
+        self.assertOrder([item1, item3, item2, item4])
+        item1.refresh_from_db()
+        item4.refresh_from_db()
+        self.assertEqual((item1.sort_order, item4.sort_order), (1, 4))
+
+    def test_move_without_neighbour(self):
+        response = self.post({'moved': self.items[0].pk})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertOrder(self.items)
+
+    def test_move_different_list(self):
+        other = SubTask.objects.create(task=Task.objects.create())
+
+        response = self.post({'moved': self.items[0].pk, 'before': other.pk})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertOrder(self.items)
+
+    def test_full_order(self):
+        """The whole order of the objects can still be sent."""
+        response = self.post({'neworder[]': [i.pk for i in self.items[::-1]]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertOrder(self.items[::-1])
+
+
+class MoveViewTest(TestCase):
+    def setUp(self):
+        self.admin = OrderableAdmin(SubTask, AdminSite())
+        self.task = Task.objects.create()
+        self.items = [SubTask.objects.create(task=self.task) for i in range(4)]
+
+    def post(self, data):
+        request = RequestFactory().post(
+            '/reorder/move/', json.dumps(data), content_type='application/json',
+        )
+        request._dont_enforce_csrf_checks = True
+        with mock.patch.object(self.admin, 'has_change_permission', return_value=True):
+            return self.admin.move_view(request)
+
+    def assertOrder(self, expected):
+        self.assertSequenceEqual(self.task.subtask_set.all(), expected)
+
+    def test_move_to_position(self):
+        """Only the objects that moved are sent back."""
+        item1, item2, item3, item4 = self.items
+
+        response = self.post({'pk': item3.pk, 'version': 3, 'position': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.content),
+            {'orders': {str(item2.pk): 3, str(item3.pk): 2}},
+        )
+        self.assertOrder([item1, item3, item2, item4])
+
+    def test_move_before(self):
+        item1, item2, item3, item4 = self.items
+
+        response = self.post({'pk': item4.pk, 'version': 4, 'before': item1.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)['orders']), 4)
+        self.assertOrder([item4, item1, item2, item3])
+
+    def test_move_after(self):
+        item1, item2, item3, item4 = self.items
+
+        self.post({'pk': item1.pk, 'version': 1, 'after': item2.pk})
+
+        self.assertOrder([item2, item1, item3, item4])
+
+    def test_stale_version(self):
+        """The list isn't changed if the object moved since the client loaded it."""
+        response = self.post({'pk': self.items[0].pk, 'version': 3, 'position': 4})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.content)['sort_order'], 1)
+        self.assertOrder(self.items)
+
+    def test_invalid(self):
+        for data in [
+            {'pk': self.items[0].pk, 'position': 4},
+            {'pk': self.items[0].pk, 'version': 1},
+            {'pk': self.items[0].pk, 'version': 1, 'position': 'top'},
+            ['not', 'an', 'object'],
+        ]:
+            with self.subTest(data=data):
+                response = self.post(data)
+                self.assertEqual(response.status_code, 400)
+        self.assertOrder(self.items)
+
+    def test_position_out_of_range(self):
+        """Positions outside the ends of the list are rejected."""
+        for position in [-5, 0, 5, 10 ** 12]:
+            with self.subTest(position=position):
+                response = self.post(
+                    {'pk': self.items[0].pk, 'version': 1, 'position': position},
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertOrder(self.items)
+
+    def test_version_locked(self):
+        """The version is checked with the row locked, in the move's transaction."""
+        item1, item2, item3, item4 = self.items
+
+        with CaptureQueriesContext(connection) as context:
+            self.post({'pk': item3.pk, 'version': 3, 'position': 2})
+
+        # Queries:
+        #     SELECT the object.
+        #     SAVEPOINT
+        #     SELECT ... FOR UPDATE its sort_order, to check the version.
+        #     ... move it.
+        sql = [query['sql'] for query in context.captured_queries]
+        self.assertTrue(sql[1].startswith('SAVEPOINT'))
+        self.assertIn('sort_order', sql[2])
+        if connection.features.has_select_for_update:
+            self.assertIn('FOR UPDATE', sql[2])
+        self.assertOrder([item1, item3, item2, item4])
+
+    def test_get(self):
+        request = RequestFactory().get('/reorder/move/')
+        with mock.patch.object(self.admin, 'has_change_permission', return_value=True):
+            response = self.admin.move_view(request)
+
+        self.assertEqual(response.status_code, 405)
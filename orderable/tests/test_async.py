@@ -0,0 +1,81 @@
+from django.test import TestCase
+
+from .models import SubTask, Task
+
+
+class TestAsync(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [SubTask.objects.create(task=self.task) for i in range(3)]
+
+    async def assertOrder(self, expected):
+        subtasks = [subtask async for subtask in self.task.subtask_set.all()]
+        self.assertSequenceEqual(subtasks, expected)
+
+    async def test_abefore_and_aafter(self):
+        item1, item2, item3 = self.items
+        subtasks = self.task.subtask_set
+
+        self.assertEqual(await subtasks.abefore(item2), item1)
+        self.assertEqual(await subtasks.aafter(item2), item3)
+        self.assertIsNone(await subtasks.abefore(item1))
+        self.assertIsNone(await subtasks.aafter(item3))
+
+    async def test_anext_item_and_aprev_item(self):
+        item1, item2, item3 = self.items
+
+        self.assertEqual(await item1.anext_item(), item2)
+        self.assertEqual(await item3.aprev_item(), item2)
+        self.assertIsNone(await item1.aprev_item())
+        self.assertIsNone(await item3.anext_item())
+
+    async def test_anext_item_with_neighbours(self):
+        item1, item2, item3 = self.items
+        first = await SubTask.objects.with_neighbours().afirst()
+
+        self.assertEqual(await first.anext_item(), item2)
+        self.assertIsNone(await first.aprev_item())
+
+    async def test_aset_orders(self):
+        await SubTask.objects.aset_orders([item.pk for item in self.items[::-1]])
+
+        await self.assertOrder(self.items[::-1])
+
+    async def test_amove_to(self):
+        item1, item2, item3 = self.items
+
+        changed = await item3.amove_to(1)
+
+        self.assertEqual(len([subtask async for subtask in changed]), 3)
+        await self.assertOrder([item3, item1, item2])
+
+    async def test_amove_above_and_below(self):
+        item1, item2, item3 = self.items
+
+        await item3.amove_above(item1)
+        await item1.amove_below(item2)
+
+        await self.assertOrder([item3, item2, item1])
+
+    async def test_ato_top_and_ato_bottom(self):
+        item1, item2, item3 = self.items
+
+        await item3.ato_top()
+        await item1.ato_bottom()
+
+        await self.assertOrder([item3, item2, item1])
+
+    async def test_aswap(self):
+        item1, item2, item3 = self.items
+
+        await item1.aswap(item3)
+
+        await self.assertOrder([item3, item2, item1])
+
+    async def test_asave(self):
+        """Django's asave() inserts objects like save() does."""
+        new = SubTask(task=self.task, sort_order=1)
+
+        await new.asave()
+
+        await self.assertOrder([new] + self.items)
@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from . import benchmark
+
+
+class TestBenchmark(TestCase):
+    def test_constant_queries(self):
+        """These operations take the same number of queries however long the list."""
+        operations = [
+            benchmark.append,
+            benchmark.insert_first,
+            benchmark.move_up,
+            benchmark.move_down,
+            benchmark.append_subtask,
+            benchmark.change_group,
+            benchmark.set_orders,
+            benchmark.bulk_append,
+        ]
+
+        results = benchmark.run([10, 50], operations)
+
+        small, large = results[:len(operations)], results[len(operations):]
+        for small_result, large_result in zip(small, large):
+            with self.subTest(operation=small_result['operation']):
+                self.assertEqual(small_result['queries'], large_result['queries'])
+
+    def test_changed(self):
+        """The objects whose sort_order changed are counted."""
+        results = benchmark.run([10], [benchmark.append, benchmark.insert_first])
+
+        self.assertEqual([result['changed'] for result in results], [1, 11])
@@ -0,0 +1,99 @@
+from django.core.cache import caches
+from django.test import override_settings, TestCase
+
+from orderable.cache import DjangoTailCache, LRUTailCache
+from .models import CachedSubTask, Task
+
+
+class TestLRUTailCache(TestCase):
+    def test_get_set_delete(self):
+        cache = LRUTailCache()
+        self.assertIsNone(cache.get(('tests.task',)))
+
+        cache.set(('tests.task',), 3)
+        self.assertEqual(cache.get(('tests.task',)), 3)
+
+        cache.delete(('tests.task',))
+        self.assertIsNone(cache.get(('tests.task',)))
+
+    def test_least_recently_used_dropped(self):
+        cache = LRUTailCache(maxsize=2)
+        cache.set(('a',), 1)
+        cache.set(('b',), 2)
+        cache.get(('a',))
+
+        cache.set(('c',), 3)
+
+        self.assertEqual(cache.get(('a',)), 1)
+        self.assertIsNone(cache.get(('b',)))
+        self.assertEqual(cache.get(('c',)), 3)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+})
+class TestDjangoTailCache(TestCase):
+    def test_get_set_delete(self):
+        cache = DjangoTailCache()
+        cache.set(('tests.subtask', 1), 3)
+        self.assertEqual(cache.get(('tests.subtask', 1)), 3)
+        self.assertEqual(caches['default'].get('orderable:tests.subtask:1'), 3)
+
+        cache.delete(('tests.subtask', 1))
+        self.assertIsNone(cache.get(('tests.subtask', 1)))
+
+
+class TestTailCacheOnSave(TestCase):
+    def setUp(self):
+        CachedSubTask.sort_order_tail_cache.clear()
+        self.task = Task.objects.create()
+
+    def test_append_uses_cache(self):
+        """Only the first append to a list looks for its end."""
+        CachedSubTask.objects.create(task=self.task)
+
+        with self.assertNumQueries(3):
+            # Queries:
+            #     Savepoint
+            #     Release savepoint
+            #     Insert
+            CachedSubTask.objects.create(task=self.task)
+
+        self.assertSequenceEqual(
+            self.task.cachedsubtask_set.values_list('sort_order', flat=True), [1, 2],
+        )
+
+    def test_insert_clears_cache(self):
+        """An insert in the middle of the list moves its end."""
+        first = CachedSubTask.objects.create(task=self.task)
+        CachedSubTask.objects.create(task=self.task, sort_order=first.sort_order)
+
+        last = CachedSubTask.objects.create(task=self.task)
+
+        self.assertEqual(last.sort_order, 3)
+
+    def test_move_clears_cache(self):
+        first = CachedSubTask.objects.create(task=self.task)
+        CachedSubTask.objects.create(task=self.task)
+        first.to_bottom()
+
+        self.assertIsNone(CachedSubTask.sort_order_tail_cache.get(
+            ('tests.cachedsubtask', self.task.pk)
+        ))
+
+    def test_bulk_append_sets_cache(self):
+        CachedSubTask.objects.bulk_append([
+            CachedSubTask(task=self.task), CachedSubTask(task=self.task),
+        ])
+
+        with self.assertNumQueries(3):
+            last = CachedSubTask.objects.create(task=self.task)
+        self.assertEqual(last.sort_order, 3)
+
+    def test_renumber_clears_cache(self):
+        CachedSubTask.objects.create(task=self.task, sort_order=5)
+        CachedSubTask.objects.renumber()
+
+        last = CachedSubTask.objects.create(task=self.task)
+
+        self.assertEqual(last.sort_order, 2)
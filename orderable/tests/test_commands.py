@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from .models import ArchivableSubTask, SubTask, Task
+
+
+class TestRenumberSortOrders(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(sort_order=5)
+        self.subtasks = [
+            SubTask.objects.create(task=self.task, sort_order=sort_order)
+            for sort_order in [3, 7]
+        ]
+
+    def call(self, *args, **kwargs):
+        stdout = StringIO()
+        call_command('renumber_sort_orders', *args, stdout=stdout, **kwargs)
+        return stdout.getvalue()
+
+    def test_renumber(self):
+        output = self.call('tests.SubTask', 'tests.Task')
+
+        self.assertEqual(
+            output,
+            'tests.SubTask: 2 objects renumbered.\n'
+            'tests.Task: 1 objects renumbered.\n',
+        )
+        self.assertSequenceEqual(
+            self.task.subtask_set.values_list('sort_order', flat=True), [1, 2],
+        )
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.sort_order, 1)
+
+    def test_all_models(self):
+        output = self.call()
+
+        self.assertIn('tests.SubTask: 2 objects renumbered.', output)
+        self.assertIn('tests.Task: 1 objects renumbered.', output)
+
+    def test_options(self):
+        self.call('tests.SubTask', start=0, step=10, batch_size=1)
+
+        self.assertSequenceEqual(
+            self.task.subtask_set.values_list('sort_order', flat=True), [0, 10],
+        )
+
+    def test_dry_run(self):
+        output = self.call('tests.SubTask', dry_run=True)
+
+        self.assertEqual(output, 'tests.SubTask: 2 objects would be renumbered.\n')
+        self.assertSequenceEqual(
+            self.task.subtask_set.values_list('sort_order', flat=True), [3, 7],
+        )
+
+    def test_objects_left_out_by_default_manager(self):
+        """Objects the default manager leaves out are renumbered too."""
+        all_objects = ArchivableSubTask._base_manager
+        for batch_size in [None, 1]:
+            with self.subTest(batch_size=batch_size):
+                all_objects.all().delete()
+                for sort_order, archived in [(3, True), (7, False), (9, False)]:
+                    ArchivableSubTask.objects.create(
+                        task=self.task, sort_order=sort_order, archived=archived,
+                    )
+
+                self.call('tests.ArchivableSubTask', batch_size=batch_size)
+
+                self.assertSequenceEqual(
+                    all_objects.order_by('sort_order').values_list(
+                        'sort_order', 'archived',
+                    ),
+                    [(1, True), (2, False), (3, False)],
+                )
+
+    def test_unknown_model(self):
+        with self.assertRaises(CommandError):
+            self.call('tests.Unknown')
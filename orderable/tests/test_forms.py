@@ -0,0 +1,83 @@
+from django.forms.models import inlineformset_factory
+from django.test import TestCase
+
+from orderable.forms import OrderableInlineFormSet
+from .models import SubTask, Task
+
+
+SubTaskFormSet = inlineformset_factory(
+    Task, SubTask, formset=OrderableInlineFormSet, fields=['sort_order'], extra=0,
+)
+
+
+class TestOrderableInlineFormSet(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [SubTask.objects.create(task=self.task) for i in range(4)]
+
+    def get_formset(self, sort_orders):
+        """Make a bound formset with the given sort_order for each item."""
+        prefix = 'subtask_set'
+        data = {
+            prefix + '-TOTAL_FORMS': len(self.items),
+            prefix + '-INITIAL_FORMS': len(self.items),
+        }
+        for i, (item, sort_order) in enumerate(zip(self.items, sort_orders)):
+            data['{}-{}-id'.format(prefix, i)] = item.pk
+            data['{}-{}-task'.format(prefix, i)] = self.task.pk
+            data['{}-{}-sort_order'.format(prefix, i)] = sort_order
+        return SubTaskFormSet(data, instance=self.task)
+
+    def assertOrder(self, expected):
+        self.assertSequenceEqual(self.task.subtask_set.all(), expected)
+        self.assertSequenceEqual(
+            self.task.subtask_set.values_list('sort_order', flat=True), [1, 2, 3, 4],
+        )
+
+    def test_reverse(self):
+        formset = self.get_formset([4, 3, 2, 1])
+        self.assertTrue(formset.is_valid())
+
+        with self.assertNumQueries(6):
+            # Queries:
+            #     Get the sort_orders of the task's subtasks
+            #     Savepoint
+            #     Get the end of the list
+            #     Lift the subtasks out of the way
+            #     Set the new sort_orders
+            #     Release savepoint
+            formset.save()
+
+        self.assertOrder(self.items[::-1])
+        self.assertEqual(
+            [form.instance.sort_order for form in formset.initial_forms], [4, 3, 2, 1],
+        )
+
+    def test_move_one(self):
+        """A moved object goes before the object already at its new sort_order."""
+        item1, item2, item3, item4 = self.items
+        formset = self.get_formset([1, 2, 3, 2])
+        self.assertTrue(formset.is_valid())
+
+        formset.save()
+
+        self.assertOrder([item1, item4, item2, item3])
+
+    def test_blank(self):
+        """A blank sort_order moves the object to the end."""
+        item1, item2, item3, item4 = self.items
+        formset = self.get_formset(['', 2, 3, 4])
+        self.assertTrue(formset.is_valid())
+
+        formset.save()
+
+        self.assertOrder([item2, item3, item4, item1])
+
+    def test_unchanged(self):
+        formset = self.get_formset([1, 2, 3, 4])
+        self.assertTrue(formset.is_valid())
+
+        with self.assertNumQueries(0):
+            formset.save()
+
+        self.assertOrder(self.items)
@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from orderable.instrumentation import measure, MemoryCollector, StatsdReporter
+from orderable.signals import ordering_operation
+from .models import SubTask, Task
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [SubTask.objects.create(task=self.task) for i in range(4)]
+
+    def test_save(self):
+        item = self.items[3]
+        item.sort_order = 1
+
+        with MemoryCollector() as collector:
+            item.save()
+
+        event, = collector.events
+        self.assertEqual(event['model'], SubTask)
+        self.assertEqual(event['operation'], 'save')
+        self.assertEqual(event['group'], ('tests.subtask', self.task.pk))
+        self.assertEqual(event['rows'], 3)
+        self.assertGreater(event['queries'], 0)
+        self.assertGreaterEqual(event['duration'], 0)
+
+    def test_move(self):
+        with MemoryCollector() as collector:
+            self.items[0].move_to(3)
+
+        event, = collector.events
+        self.assertEqual(event['operation'], 'move_to')
+        self.assertEqual(event['rows'], 2)
+        self.assertEqual(event['retries'], 0)
+
+    def test_set_orders(self):
+        pks = [item.pk for item in reversed(self.items)]
+
+        with MemoryCollector() as collector:
+            SubTask.objects.set_orders(pks)
+
+        event, = collector.events
+        self.assertEqual(event['operation'], 'set_orders')
+        self.assertIsNone(event['group'])
+        self.assertEqual(event['rows'], 4)
+
+    def test_update_retry(self):
+        """A clashing shift falls back to one UPDATE per row, counted as a retry."""
+        with MemoryCollector() as collector:
+            with measure(SubTask, 'shift', lambda: None):
+                objects = self.task.subtask_set.all()
+                SubTask._shift(objects, objects, 1)
+
+        event, = collector.events
+        self.assertEqual(event['rows'], 4)
+        self.assertEqual(event['retries'], 1)
+
+    def test_nested(self):
+        """Operations that call each other are reported once."""
+        with MemoryCollector() as collector:
+            with measure(SubTask, 'outer', lambda: None):
+                self.items[0].move_to(3)
+
+        event, = collector.events
+        self.assertEqual(event['operation'], 'outer')
+
+    def test_sender(self):
+        with MemoryCollector(sender=Task) as collector:
+            self.items[0].move_to(3)
+
+        self.assertEqual(collector.events, [])
+
+    def test_disconnect(self):
+        with MemoryCollector():
+            pass
+
+        self.assertFalse(ordering_operation.has_listeners(SubTask))
+
+    def test_no_listeners(self):
+        """Nothing is measured without a receiver."""
+        with mock.patch('orderable.instrumentation.Operation') as operation:
+            self.items[0].move_to(3)
+
+        operation.assert_not_called()
+
+    def test_statsd(self):
+        client = mock.Mock()
+
+        with StatsdReporter(client, prefix='app'):
+            self.items[0].move_to(3)
+
+        name = 'app.tests.subtask.move_to'
+        client.timing.assert_called_once_with(name, mock.ANY)
+        client.incr.assert_any_call(name + '.rows', 2)
@@ -0,0 +1,134 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from orderable.locks import AdvisoryLock, NoLock
+from .models import LockedSubTask, Task
+
+
+class TestLockedOrdering(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [LockedSubTask.objects.create(task=self.task) for i in range(5)]
+
+    def assertOrder(self, expected):
+        self.assertSequenceEqual(self.task.lockedsubtask_set.all(), expected)
+        self.assertSequenceEqual(
+            self.task.lockedsubtask_set.values_list('sort_order', flat=True),
+            list(range(1, len(expected) + 1)),
+        )
+
+    def test_append(self):
+        item = LockedSubTask.objects.create(task=self.task)
+        self.assertOrder(self.items + [item])
+
+    def test_save_decrease(self):
+        item1, item2, item3, item4, item5 = self.items
+        item4.sort_order = 1
+
+        item4.save()
+
+        self.assertOrder([item4, item1, item2, item3, item5])
+
+    def test_save_increase(self):
+        item1, item2, item3, item4, item5 = self.items
+        item1.sort_order = 4
+
+        item1.save()
+
+        self.assertOrder([item2, item3, item4, item1, item5])
+
+    def test_insert(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        new = LockedSubTask.objects.create(task=self.task, sort_order=2)
+
+        self.assertOrder([item1, new, item2, item3, item4, item5])
+
+    def test_stale_instance(self):
+        """The position of self is read again once the list is locked."""
+        item1, item2, item3, item4, item5 = self.items
+        item5.to_top()
+        item3.sort_order = 5
+
+        item3.save()
+
+        self.assertOrder([item5, item1, item2, item4, item3])
+
+    def test_change_list_and_move(self):
+        """Moving to a sort_order in another list inserts it there, locking both."""
+        item1, item2, item3, item4, item5 = self.items
+        other_task = Task.objects.create()
+        other = LockedSubTask.objects.create(task=other_task)
+        item3.task = other_task
+        item3.sort_order = 1
+
+        lock = LockedSubTask.sort_order_lock
+        with mock.patch.object(lock, 'acquire', wraps=lock.acquire) as acquire:
+            item3.save()
+
+        keys = [call[0][1] for call in acquire.call_args_list]
+        self.assertEqual(keys, sorted(keys, key=repr))
+        self.assertCountEqual(keys, [
+            ('tests.lockedsubtask', self.task.pk), ('tests.lockedsubtask', other_task.pk),
+        ])
+        self.assertSequenceEqual(other_task.lockedsubtask_set.all(), [item3, other])
+        self.assertSequenceEqual(
+            other_task.lockedsubtask_set.values_list('sort_order', flat=True), [1, 2],
+        )
+        self.assertSequenceEqual(
+            self.task.lockedsubtask_set.all(), [item1, item2, item4, item5],
+        )
+
+    def test_move_api(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        item5.move_above(item2)
+        self.assertOrder([item1, item5, item2, item3, item4])
+
+        item1.move_below(item3)
+        self.assertOrder([item5, item2, item3, item1, item4])
+
+    def test_bulk_insert_at(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        new = LockedSubTask.objects.bulk_insert_at(
+            [LockedSubTask(task=self.task), LockedSubTask(task=self.task)], position=1,
+        )
+
+        self.assertOrder(new + self.items)
+
+    def test_no_row_by_row_shift(self):
+        """Shifting the list takes the same number of queries however long it is."""
+        with CaptureQueriesContext(connection) as short:
+            LockedSubTask.objects.create(task=self.task, sort_order=1)
+
+        for i in range(20):
+            LockedSubTask.objects.create(task=self.task)
+        with CaptureQueriesContext(connection) as long:
+            LockedSubTask.objects.create(task=self.task, sort_order=1)
+
+        self.assertEqual(len(short), len(long))
+
+    def test_no_lock(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        with mock.patch.object(LockedSubTask, 'sort_order_lock', NoLock()):
+            item5.sort_order = 1
+            item5.save()
+
+        self.assertOrder([item5, item1, item2, item3, item4])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Advisory locks need PostgreSQL.')
+    def test_advisory_lock(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        with mock.patch.object(LockedSubTask, 'sort_order_lock', AdvisoryLock()):
+            with CaptureQueriesContext(connection) as context:
+                item5.sort_order = 1
+                item5.save()
+
+        self.assertIn('pg_advisory_xact_lock', context.captured_queries[1]['sql'])
+        self.assertOrder([item5, item1, item2, item3, item4])
@@ -1,9 +1,27 @@
+from unittest import mock, skipUnless
+
+from django.apps import apps
 from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext, isolate_apps
 from hypothesis import example, given
 from hypothesis.extra.django import TestCase
 from hypothesis.strategies import integers, lists
 
-from .models import SubTask, Task
+from orderable.constraints import deferred_sort_order_constraint
+from orderable.indexes import sort_order_index
+from orderable.models import Orderable
+from .models import (
+    CompactSubTask,
+    CompactTask,
+    ConstrainedSubTask,
+    DeferredSubTask,
+    GappedTask,
+    PartitionedTask,
+    SubTask,
+    Task,
+)
 
 
 class TestOrderingOnSave(TestCase):
@@ -11,13 +29,22 @@ class TestOrderingOnSave(TestCase):
         """Normal saves should avoid giggery pokery."""
         task = Task.objects.create()
 
-        with self.assertNumQueries(3):
+        with self.assertNumQueries(1):
             # Queries:
-            #     SAVEPOINT
             #     UPDATE
-            #     COMMIT
             task.save()
 
+    def test_save_twice(self):
+        """The second move starts from where the first one left the object."""
+        item1, item2, item3 = [Task.objects.create() for i in range(3)]
+        item1.sort_order = 3
+        item1.save()
+
+        item1.sort_order = 2
+        item1.save()
+
+        self.assertSequenceEqual(Task.objects.all(), [item2, item1, item3])
+
     def test_unspecified_order(self):
         """New inserts should default to the end of the list.
 
@@ -53,13 +80,11 @@ class TestOrderingOnSave(TestCase):
         old_3 = Task.objects.create(sort_order=3)
 
         # Insert between old_1 and old_2
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(4):
             # Queries:
             #     Savepoint
-            #     Savepoint
             #     Bump old_2 to position 3
             #     Release savepoint
-            #     Release savepoint
             #     Save new in position 2
             new = Task.objects.create(sort_order=old_2.sort_order)
 
@@ -85,14 +110,12 @@ class TestOrderingOnSave(TestCase):
         item5 = Task.objects.create(sort_order=5)
 
         # Move item2 to position 4
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(4):
             # Queries:
             #     Savepoint
-            #     Find end of list
-            #     Move item2 to end of list
             #     Shuffle item3 and item4 back by one
+            #     Release savepoint
             #     Save item2 to new desired position
-            #     Commit
             item2.sort_order = item4.sort_order
             item2.save()
 
@@ -119,15 +142,11 @@ class TestOrderingOnSave(TestCase):
         item5 = Task.objects.create(sort_order=5)
 
         # Move item4 to position 2
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(4):
             # Queries:
             #     Savepoint
-            #     Find end of list
-            #     Move item4 to end of list
-            #     Savepoint
             #     Bump item2 and item3 on by one
             #     Release savepoint
-            #     Release savepoint
             #     Save item4 to new desired position
             item4.sort_order = item2.sort_order
             item4.save()
@@ -173,6 +192,24 @@ class TestOrderingOnSave(TestCase):
 
 class TestSubTask(TestCase):
 
+    def test_sort_order_metadata(self):
+        """What sort_order is unique with is worked out when the class is prepared."""
+        self.assertEqual(SubTask._sort_order_group_fields, ('task_id',))
+        self.assertEqual(
+            SubTask._sort_order_tracked_fields, frozenset(['sort_order', 'task_id']),
+        )
+        self.assertIs(SubTask._sort_order_unique, True)
+        self.assertIs(Task._sort_order_unique, False)
+
+    def test_init_does_not_inspect_meta(self):
+        """Loading an object doesn't walk unique_together for every field."""
+        with mock.patch.object(SubTask, 'get_unique_fields') as get_unique_fields:
+            subtask = SubTask(task_id=1, sort_order=1)
+            subtask.sort_order = 2
+
+        get_unique_fields.assert_not_called()
+        self.assertEqual(subtask._original_sort_order, 1)
+
     def test_duplicated_sort_order_on_different_parents(self):
         task = Task.objects.create()
         task_2 = Task.objects.create()
@@ -201,6 +238,107 @@ class TestSubTask(TestCase):
             subtasks[1],
         ])
 
+    def test_save_update_fields(self):
+        """Saves that don't write sort_order or task don't touch the order."""
+        task = Task.objects.create()
+        item1, item2 = [SubTask.objects.create(task=task) for i in range(2)]
+        item2.sort_order = 1
+        item2.title = 'Second'
+
+        with self.assertNumQueries(1):
+            # Queries:
+            #     UPDATE title
+            item2.save(update_fields=['title'])
+
+        self.assertSequenceEqual(task.subtask_set.all(), [item1, item2])
+        self.assertEqual(task.subtask_set.get(title='Second'), item2)
+
+    def test_save_sort_order_only(self):
+        """A move with update_fields only writes sort_order, even while parked."""
+        task = Task.objects.create()
+        item1, item2, item3 = [
+            SubTask.objects.create(task=task, title='Item') for i in range(3)
+        ]
+        item3.sort_order = 1
+        item3.title = 'Unsaved'
+
+        with CaptureQueriesContext(connection) as context:
+            item3.save(update_fields=['sort_order'])
+
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        self.assertFalse([sql for sql in updates if 'title' in sql])
+        self.assertSequenceEqual(task.subtask_set.all(), [item3, item1, item2])
+        self.assertEqual(task.subtask_set.filter(title='Item').count(), 3)
+
+    def test_save_move_writes_row_once(self):
+        """A moved object is only written in full once, if nothing else changed."""
+        task = Task.objects.create()
+        item1, item2, item3 = [
+            SubTask.objects.create(task=task, title='Item') for i in range(3)
+        ]
+        item3.sort_order = 1
+
+        with CaptureQueriesContext(connection) as context:
+            item3.save()
+
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        self.assertFalse([sql for sql in updates if 'title' in sql])
+        self.assertSequenceEqual(task.subtask_set.all(), [item3, item1, item2])
+
+    def test_save_move_and_change(self):
+        """Other fields changed along with a move are still saved."""
+        task = Task.objects.create()
+        item1, item2 = [SubTask.objects.create(task=task) for i in range(2)]
+        item2.sort_order = 1
+        item2.title = 'Moved'
+
+        item2.save()
+
+        self.assertSequenceEqual(task.subtask_set.all(), [item2, item1])
+        self.assertEqual(task.subtask_set.get(title='Moved'), item2)
+
+    def test_save_move_and_change_deferred(self):
+        """A deferred field set along with a move is still saved."""
+        task = Task.objects.create()
+        item1, item2 = [SubTask.objects.create(task=task) for i in range(2)]
+        item2 = SubTask.objects.only('pk', 'sort_order', 'task').get(pk=item2.pk)
+        item2.title = 'Moved'
+        item2.sort_order = 1
+
+        item2.save()
+
+        self.assertSequenceEqual(task.subtask_set.all(), [item2, item1])
+        self.assertEqual(task.subtask_set.get(title='Moved'), item2)
+
+    def test_save_move_after_update_fields(self):
+        """A change left out of `update_fields` is written by the next move."""
+        task = Task.objects.create()
+        item1, item2 = [SubTask.objects.create(task=task) for i in range(2)]
+        item2.title = 'Unsaved'
+        item2.save(update_fields=['sort_order'])
+
+        item2.sort_order = 1
+        item2.save()
+
+        self.assertEqual(task.subtask_set.get(title='Unsaved'), item2)
+
+    def test_save_unmoved(self):
+        """An object that hasn't moved is saved with just the UPDATE."""
+        task = Task.objects.create()
+        item = SubTask.objects.create(task=task)
+        item.title = 'Renamed'
+
+        with self.assertNumQueries(1):
+            # Queries:
+            #     UPDATE
+            item.save()
+
     def test_changing_parent(self):
         """Check changing the unique together parent."""
         task = Task.objects.create()
@@ -275,3 +413,544 @@ class TestSubTask(TestCase):
             task.validate_unique()
         except ValidationError:
             self.fail("Task.clean() raised ValidationError unexpectedly!")
+
+
+class TestGappedOrdering(TestCase):
+    def assertOrders(self, expected):
+        self.assertSequenceEqual(
+            GappedTask.objects.values_list('pk', 'sort_order'),
+            [(item.pk, order) for item, order in expected],
+        )
+
+    def test_unspecified_order(self):
+        """New inserts are placed a gap after the end of the list."""
+        first = GappedTask.objects.create()
+        second = GappedTask.objects.create()
+        self.assertOrders([(first, 4), (second, 8)])
+
+    def test_insert_on_create(self):
+        """Inserting onto a taken sort_order only writes the new object.
+
+        sort_order:  4      6      8
+        Before:    old_1         old_2
+        After:     old_1   new   old_2
+        """
+        old_1 = GappedTask.objects.create()
+        old_2 = GappedTask.objects.create()
+
+        with self.assertNumQueries(5):
+            # Queries:
+            #     Savepoint
+            #     Find the object at sort_order 8
+            #     Find the object before it
+            #     Release savepoint
+            #     Insert new
+            new = GappedTask.objects.create(sort_order=old_2.sort_order)
+
+        self.assertOrders([(old_1, 4), (new, 6), (old_2, 8)])
+
+    def test_increase_order(self):
+        """Moving down the list lands just after the object at the new sort_order."""
+        item1, item2, item3 = [GappedTask.objects.create() for i in range(3)]
+
+        item1.sort_order = item2.sort_order
+        item1.save()
+
+        self.assertOrders([(item2, 8), (item1, 10), (item3, 12)])
+
+    def test_decrease_order(self):
+        """Moving up the list lands just before the object at the new sort_order."""
+        item1, item2, item3 = [GappedTask.objects.create() for i in range(3)]
+
+        item3.sort_order = item1.sort_order
+        item3.save()
+
+        self.assertOrders([(item3, 2), (item1, 4), (item2, 8)])
+
+    def test_free_sort_order(self):
+        """A sort_order that isn't taken is used as it is."""
+        item1, item2 = [GappedTask.objects.create() for i in range(2)]
+
+        item2.sort_order = 1
+        item2.save()
+
+        self.assertOrders([(item2, 1), (item1, 4)])
+
+    def test_renumber_when_gap_used_up(self):
+        """The list is spaced out again once there's no gap left."""
+        item1, item2 = [GappedTask.objects.create() for i in range(2)]
+        new_1 = GappedTask.objects.create(sort_order=item2.sort_order)
+        new_2 = GappedTask.objects.create(sort_order=item2.sort_order)
+        self.assertOrders([(item1, 4), (new_1, 6), (new_2, 7), (item2, 8)])
+
+        new_3 = GappedTask.objects.create(sort_order=item2.sort_order)
+
+        self.assertOrders([
+            (item1, 4), (new_1, 8), (new_2, 12), (new_3, 14), (item2, 16),
+        ])
+
+    def test_next_and_prev(self):
+        item1, item2 = [GappedTask.objects.create() for i in range(2)]
+
+        self.assertEqual(item1.next(), item2)
+        self.assertEqual(item2.prev(), item1)
+        self.assertIsNone(item2.next())
+
+
+class TestMoveAPI(TestCase):
+    def setUp(self):
+        self.items = [Task.objects.create() for i in range(5)]
+
+    def assertOrder(self, model, expected):
+        self.assertSequenceEqual(model.objects.all(), expected)
+        self.assertSequenceEqual(
+            model.objects.values_list('sort_order', flat=True),
+            list(range(1, len(expected) + 1)),
+        )
+
+    def test_move_to_decrease(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        with self.assertNumQueries(5):
+            # Queries:
+            #     Find current position and ends of the list
+            #     Savepoint
+            #     Bump item2 and item3 on by one
+            #     Write item4's sort_order
+            #     Release savepoint
+            changed = item4.move_to(2)
+
+        self.assertEqual(item4.sort_order, 2)
+        self.assertOrder(Task, [item1, item4, item2, item3, item5])
+        self.assertCountEqual(changed, [item4, item2, item3])
+
+    def test_move_to_increase(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        with self.assertNumQueries(5):
+            # Queries:
+            #     Find current position and ends of the list
+            #     Savepoint
+            #     Shuffle item3 and item4 back by one
+            #     Write item2's sort_order
+            #     Release savepoint
+            changed = item2.move_to(4)
+
+        self.assertOrder(Task, [item1, item3, item4, item2, item5])
+        self.assertCountEqual(changed, [item3, item4, item2])
+
+    def test_move_to_same_position(self):
+        with self.assertNumQueries(1):
+            changed = self.items[2].move_to(3)
+
+        self.assertSequenceEqual(changed, [])
+
+    def test_move_to_only_writes_sort_order(self):
+        """No other columns are written."""
+        with CaptureQueriesContext(connection) as context:
+            self.items[0].move_to(3)
+
+        updates = [q['sql'] for q in context.captured_queries if 'UPDATE' in q['sql']]
+        self.assertEqual(len(updates), 2)
+        for sql in updates:
+            self.assertIn('SET "sort_order" =', sql)
+            self.assertNotIn(',', sql.split('WHERE')[0])
+
+    def test_move_above(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        item2.move_above(item4)
+        self.assertOrder(Task, [item1, item3, item2, item4, item5])
+
+        item5.move_above(item1)
+        self.assertOrder(Task, [item5, item1, item3, item2, item4])
+
+    def test_move_below(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        item2.move_below(item4)
+        self.assertOrder(Task, [item1, item3, item4, item2, item5])
+
+        item5.move_below(item1)
+        self.assertOrder(Task, [item1, item5, item3, item4, item2])
+
+    def test_to_top_and_bottom(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        item3.to_top()
+        self.assertOrder(Task, [item3, item1, item2, item4, item5])
+
+        item1.to_bottom()
+        self.assertOrder(Task, [item3, item2, item4, item5, item1])
+
+    def test_swap(self):
+        item1, item2, item3, item4, item5 = self.items
+
+        with self.assertNumQueries(4):
+            # Queries:
+            #     Find both positions
+            #     Savepoint
+            #     Write both sort_orders
+            #     Release savepoint
+            item2.swap(item4)
+
+        self.assertEqual((item2.sort_order, item4.sort_order), (4, 2))
+        self.assertOrder(Task, [item1, item4, item3, item2, item5])
+
+    def test_stale_instance(self):
+        """The current position is read from the database."""
+        item1, item2, item3, item4, item5 = self.items
+        item5.move_to(1)
+
+        item4.move_to(2)
+
+        self.assertOrder(Task, [item5, item4, item1, item2, item3])
+
+    def test_unsaved(self):
+        with self.assertRaises(ValueError):
+            Task(sort_order=1).move_to(2)
+
+    def test_different_lists(self):
+        task = Task.objects.create()
+        subtask = SubTask.objects.create(task=task)
+        other = SubTask.objects.create(task=self.items[0])
+
+        with self.assertRaises(ValueError):
+            subtask.move_above(other)
+
+    def test_unique_together(self):
+        task = self.items[0]
+        item1, item2, item3, item4 = [SubTask.objects.create(task=task) for i in range(4)]
+
+        item4.to_top()
+        self.assertOrder(SubTask, [item4, item1, item2, item3])
+
+        item4.move_below(item2)
+        self.assertOrder(SubTask, [item1, item2, item4, item3])
+
+        item1.swap(item3)
+        self.assertOrder(SubTask, [item3, item2, item4, item1])
+
+    def test_gapped(self):
+        item1, item2, item3 = [GappedTask.objects.create() for i in range(3)]
+
+        with self.assertNumQueries(6):
+            # Queries:
+            #     Find current position and ends of the list
+            #     Savepoint
+            #     Find the object at item1's sort_order
+            #     Find the object before it
+            #     Write item3's sort_order
+            #     Release savepoint
+            changed = item3.move_above(item1)
+
+        self.assertSequenceEqual(changed, [item3])
+        self.assertSequenceEqual(
+            GappedTask.objects.values_list('pk', 'sort_order'),
+            [(item3.pk, 2), (item1.pk, 4), (item2.pk, 8)],
+        )
+
+        item3.move_below(item1)
+        self.assertSequenceEqual(GappedTask.objects.all(), [item1, item3, item2])
+
+        item1.to_bottom()
+        self.assertSequenceEqual(GappedTask.objects.all(), [item3, item2, item1])
+
+
+class TestPartitions(TestCase):
+    def test_unique_constraint(self):
+        """A UniqueConstraint splits objects into lists like unique_together."""
+        task_1 = Task.objects.create()
+        task_2 = Task.objects.create()
+        first = ConstrainedSubTask.objects.create(task=task_1)
+        other = ConstrainedSubTask.objects.create(task=task_2)
+        second = ConstrainedSubTask.objects.create(task=task_1)
+
+        new = ConstrainedSubTask.objects.create(task=task_1, sort_order=1)
+
+        self.assertEqual(new.get_unique_fields(), ['task_id'])
+        self.assertSequenceEqual(
+            task_1.constrainedsubtask_set.all(), [new, first, second],
+        )
+        other.refresh_from_db()
+        self.assertEqual(other.sort_order, 1)
+
+    def test_unique_constraint_validation(self):
+        """sort_order clashes are left for save() to sort out."""
+        task = Task.objects.create()
+        ConstrainedSubTask.objects.create(task=task)
+        item = ConstrainedSubTask.objects.create(task=task)
+        item.sort_order = 1
+        try:
+            item.full_clean()
+        except ValidationError:
+            self.fail('ConstrainedSubTask.full_clean() raised ValidationError!')
+
+    @isolate_apps('orderable.tests')
+    def test_conditional_unique_constraint(self):
+        class ConditionalSubTask(Orderable):
+            task = models.ForeignKey('Task', models.CASCADE)
+            archived = models.BooleanField(default=False)
+
+            class Meta(Orderable.Meta):
+                constraints = [
+                    models.UniqueConstraint(
+                        fields=['task', 'sort_order'],
+                        condition=models.Q(archived=False),
+                        name='conditional_subtask_uniq',
+                    ),
+                ]
+
+        self.assertEqual(ConditionalSubTask._sort_order_group_fields, ('task_id',))
+        self.assertIs(ConditionalSubTask._sort_order_unique, True)
+
+    def test_explicit_partition(self):
+        """Non-FK fields can partition the lists, without a unique constraint."""
+        first = PartitionedTask.objects.create(category='a')
+        other = PartitionedTask.objects.create(category='b')
+
+        with self.assertNumQueries(4):
+            # Queries:
+            #     Savepoint
+            #     Bump `first` on by one, leaving category 'b' alone
+            #     Release savepoint
+            #     Save new in position 1
+            new = PartitionedTask.objects.create(category='a', sort_order=1)
+
+        self.assertEqual(new.get_unique_fields(), ['category'])
+        self.assertIs(PartitionedTask._sort_order_unique, False)
+        self.assertSequenceEqual(
+            PartitionedTask.objects.filter(category='a'), [new, first],
+        )
+        other.refresh_from_db()
+        self.assertEqual(other.sort_order, 1)
+
+
+class TestSortOrderIndexCheck(TestCase):
+    def test_test_models(self):
+        for model in apps.get_app_config('tests').get_models():
+            self.assertEqual(model._check_sort_order_index(), [], model)
+
+    @isolate_apps('orderable.tests')
+    def test_missing_index(self):
+        class UnindexedTask(Orderable):
+            category = models.CharField(max_length=10)
+
+            sort_order_partition = ('category',)
+
+        errors = UnindexedTask.check()
+
+        warning = [e for e in errors if e.id == 'orderable.W001'][0]
+        self.assertEqual(
+            warning.hint,
+            "Add orderable.indexes.sort_order_index('category') to Meta.indexes.",
+        )
+
+    @isolate_apps('orderable.tests')
+    def test_index(self):
+        class IndexedTask(Orderable):
+            category = models.CharField(max_length=10)
+
+            sort_order_partition = ('category',)
+
+            class Meta(Orderable.Meta):
+                indexes = [sort_order_index('category')]
+
+        self.assertEqual(IndexedTask._check_sort_order_index(), [])
+
+    @isolate_apps('orderable.tests')
+    def test_index_wrong_order(self):
+        """sort_order has to come after the list fields."""
+        class BackwardsTask(Orderable):
+            category = models.CharField(max_length=10)
+
+            sort_order_partition = ('category',)
+
+            class Meta(Orderable.Meta):
+                indexes = [models.Index(fields=['sort_order', 'category'])]
+
+        errors = BackwardsTask._check_sort_order_index()
+
+        self.assertEqual([e.id for e in errors], ['orderable.W001'])
+
+    @isolate_apps('orderable.tests')
+    def test_conditional_unique_constraint(self):
+        """A partial index doesn't cover the whole list."""
+        class ConditionalSubTask(Orderable):
+            task = models.ForeignKey('Task', models.CASCADE)
+            archived = models.BooleanField(default=False)
+
+            class Meta(Orderable.Meta):
+                constraints = [
+                    models.UniqueConstraint(
+                        fields=['task', 'sort_order'],
+                        condition=models.Q(archived=False),
+                        name='conditional_subtask_uniq',
+                    ),
+                ]
+
+        errors = ConditionalSubTask._check_sort_order_index()
+
+        self.assertEqual([e.id for e in errors], ['orderable.W001'])
+
+
+class TestCloseGapsOnDelete(TestCase):
+    def test_delete(self):
+        item1, item2, item3 = [CompactTask.objects.create() for i in range(3)]
+
+        with self.assertNumQueries(4):
+            # Queries:
+            #     Savepoint
+            #     Delete item1
+            #     Shift item2 and item3 down by one
+            #     Release savepoint
+            item1.delete()
+
+        self.assertSequenceEqual(
+            CompactTask.objects.values_list('pk', 'sort_order'),
+            [(item2.pk, 1), (item3.pk, 2)],
+        )
+
+    def test_delete_unique_together(self):
+        task = Task.objects.create()
+        other_task = Task.objects.create()
+        items = [CompactSubTask.objects.create(task=task) for i in range(4)]
+        other = CompactSubTask.objects.create(task=other_task)
+
+        items[1].delete()
+
+        self.assertSequenceEqual(
+            task.compactsubtask_set.values_list('pk', 'sort_order'),
+            [(items[0].pk, 1), (items[2].pk, 2), (items[3].pk, 3)],
+        )
+        other.refresh_from_db()
+        self.assertEqual(other.sort_order, 1)
+
+    def test_delete_without_close_gaps(self):
+        """By default, deleting leaves a gap."""
+        item1, item2 = Task.objects.create(), Task.objects.create()
+
+        item1.delete()
+
+        item2.refresh_from_db()
+        self.assertEqual(item2.sort_order, 2)
+
+
+class TestDeferredConstraint(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [DeferredSubTask.objects.create(task=self.task) for i in range(4)]
+
+    def assertOrder(self, expected):
+        self.assertSequenceEqual(self.task.deferredsubtask_set.all(), expected)
+        self.assertSequenceEqual(
+            self.task.deferredsubtask_set.values_list('sort_order', flat=True),
+            list(range(1, len(expected) + 1)),
+        )
+
+    def test_group_fields(self):
+        self.assertEqual(self.items[0].get_unique_fields(), ['task_id'])
+
+    def test_insert_on_create(self):
+        item1, item2, item3, item4 = self.items
+
+        with self.assertNumQueries(4):
+            # Queries:
+            #     Savepoint
+            #     Bump item2, item3 and item4 on by one in a single UPDATE
+            #     Release savepoint
+            #     Save new in position 2
+            new = DeferredSubTask.objects.create(task=self.task, sort_order=2)
+
+        self.assertOrder([item1, new, item2, item3, item4])
+
+    def test_decrease_order(self):
+        item1, item2, item3, item4 = self.items
+        item4.sort_order = 1
+
+        with self.assertNumQueries(4):
+            # Queries:
+            #     Savepoint
+            #     Bump item1, item2 and item3 on by one in a single UPDATE
+            #     Release savepoint
+            #     Save item4 to new desired position
+            item4.save()
+
+        self.assertOrder([item4, item1, item2, item3])
+
+    def test_increase_order(self):
+        item1, item2, item3, item4 = self.items
+
+        item1.move_to(4)
+
+        self.assertOrder([item2, item3, item4, item1])
+
+    def test_set_orders(self):
+        """No objects are lifted out of the way first."""
+        with self.assertNumQueries(4):
+            self.task.deferredsubtask_set.set_orders([i.pk for i in self.items[::-1]])
+
+        self.assertOrder(self.items[::-1])
+
+    def test_validate_constraints(self):
+        """sort_order clashes are left for save() to sort out."""
+        item = self.items[0]
+        item.sort_order = 2
+        try:
+            item.full_clean()
+        except ValidationError:
+            self.fail('DeferredSubTask.full_clean() raised ValidationError unexpectedly!')
+
+    @isolate_apps('orderable.tests')
+    def test_check_also_unique_together(self):
+        class BothSubTask(Orderable):
+            task = models.ForeignKey('Task', models.CASCADE)
+
+            class Meta(Orderable.Meta):
+                unique_together = ('task', 'sort_order')
+                constraints = [deferred_sort_order_constraint('task')]
+
+        errors = BothSubTask.check()
+
+        self.assertIn('orderable.W002', [e.id for e in errors])
+
+    def test_check_ok(self):
+        self.assertEqual(DeferredSubTask._check_deferred_sort_order(), [])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Deferred constraints need PostgreSQL.')
+class TestDeferredConstraintCommits(TransactionTestCase):
+    """Saves outside a transaction commit with the deferred constraint satisfied."""
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [DeferredSubTask.objects.create(task=self.task) for i in range(4)]
+
+    def assertOrder(self, expected):
+        self.assertSequenceEqual(self.task.deferredsubtask_set.all(), expected)
+        self.assertSequenceEqual(
+            self.task.deferredsubtask_set.values_list('sort_order', flat=True),
+            list(range(1, len(expected) + 1)),
+        )
+
+    def test_move_up(self):
+        item1, item2, item3, item4 = self.items
+        item4.sort_order = 2
+
+        item4.save()
+
+        self.assertOrder([item1, item4, item2, item3])
+
+    def test_move_down(self):
+        item1, item2, item3, item4 = self.items
+        item1.sort_order = 3
+
+        item1.save()
+
+        self.assertOrder([item2, item3, item1, item4])
+
+    def test_insert(self):
+        item1, item2, item3, item4 = self.items
+
+        new = DeferredSubTask.objects.create(task=self.task, sort_order=2)
+
+        self.assertOrder([item1, new, item2, item3, item4])
@@ -0,0 +1,72 @@
+from django.test import TestCase
+
+from orderable.pagination import KeysetPaginator
+from .models import SubTask, Task
+
+
+class TestKeysetPaginator(TestCase):
+    def setUp(self):
+        self.tasks = [Task.objects.create() for i in range(2)]
+        self.items = [
+            SubTask.objects.create(task=task) for task in self.tasks for i in range(3)
+        ]
+        self.paginator = KeysetPaginator(SubTask.objects.all(), per_page=2)
+
+    def test_first_page(self):
+        page = self.paginator.page()
+
+        self.assertSequenceEqual(page, self.items[:2])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertIsNone(page.previous_key)
+
+    def test_forwards(self):
+        """Pages run through each list in turn."""
+        pages = [self.paginator.page()]
+        while pages[-1].has_next():
+            pages.append(self.paginator.page(after=pages[-1].next_key))
+
+        self.assertEqual([list(page) for page in pages], [
+            self.items[:2], self.items[2:4], self.items[4:],
+        ])
+        self.assertIsNone(pages[-1].next_key)
+
+    def test_backwards(self):
+        page = self.paginator.page(before=self.items[5])
+
+        self.assertSequenceEqual(page, self.items[3:5])
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+        page = self.paginator.page(before=page.previous_key)
+        self.assertSequenceEqual(page, self.items[1:3])
+
+        page = self.paginator.page(before=page.previous_key)
+        self.assertSequenceEqual(page, self.items[:1])
+        self.assertFalse(page.has_previous())
+
+    def test_after_object(self):
+        page = self.paginator.page(after=self.items[2])
+
+        self.assertSequenceEqual(page, self.items[3:5])
+
+    def test_one_query(self):
+        """
+        Any page takes a single query.
+
+        # Queries:
+            SELECT the page and one more object after the key.
+        """
+        key = self.paginator.get_key(self.items[3])
+
+        with self.assertNumQueries(1):
+            page = self.paginator.page(after=key)
+            self.assertSequenceEqual(page, self.items[4:])
+
+    def test_after_and_before(self):
+        with self.assertRaises(ValueError):
+            self.paginator.page(after=self.items[0], before=self.items[1])
+
+    def test_bad_key(self):
+        with self.assertRaises(ValueError):
+            self.paginator.page(after=(1,))
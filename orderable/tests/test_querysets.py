@@ -1,6 +1,11 @@
+import re
+
+import django
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from .models import Task
+from .models import CompactSubTask, CompactTask, GappedTask, SubTask, Task
 
 
 class TestOrderableQueryset(TestCase):
@@ -55,21 +60,630 @@ class TestOrderableQueryset(TestCase):
         Task.objects.create(sort_order=5, pk=3)
         Task.objects.create(sort_order=8, pk=4)
 
-        with self.assertNumQueries(7):
+        with self.assertNumQueries(4):
             """
-            SELECT MAX("tests_task"."sort_order") AS "sort_order__max" FROM "tests_task"
-            SELECT "tests_task"."sort_order"
+            SELECT "tests_task"."id", "tests_task"."sort_order"
               FROM "tests_task"
               WHERE "tests_task"."id" IN (3, 2) ORDER BY "tests_task"."sort_order" ASC
 
             SAVEPOINT "s47832829518016_x11457"
             UPDATE "tests_task"
-              SET "sort_order" = ("tests_task"."sort_order" + 8)
+              SET "sort_order" = CASE WHEN ("tests_task"."id" = 3) THEN 4
+                                      WHEN ("tests_task"."id" = 2) THEN 5
+                                      ELSE NULL END
               WHERE "tests_task"."id" IN (3, 2)
 
-            UPDATE "tests_task" SET "sort_order" = 4 WHERE "tests_task"."id" = 3
-            UPDATE "tests_task" SET "sort_order" = 5 WHERE "tests_task"."id" = 2
-
             RELEASE SAVEPOINT "s47832829518016_x11457"
             """
             Task.objects.set_orders([3, 2])
+
+    def test_set_orders_batch_size(self):
+        """Batches of changed objects are written with one UPDATE each."""
+        tasks = [Task.objects.create(sort_order=i, pk=i) for i in range(1, 6)]
+
+        with self.assertNumQueries(5):
+            """
+            SELECT id, sort_order, SAVEPOINT, two UPDATEs of two objects each (task 3
+            stays where it is), RELEASE SAVEPOINT.
+            """
+            Task.objects.set_orders([5, 4, 3, 2, 1], batch_size=2)
+
+        self.assertSequenceEqual(Task.objects.all(), tasks[::-1])
+        self.assertSequenceEqual(
+            Task.objects.values_list('sort_order', flat=True),
+            [1, 2, 3, 4, 5],
+        )
+
+    def test_set_orders_unchanged(self):
+        """Nothing is written when the order hasn't changed."""
+        Task.objects.create(sort_order=1, pk=1)
+        Task.objects.create(sort_order=2, pk=2)
+
+        with self.assertNumQueries(1):
+            Task.objects.set_orders([1, 2])
+
+    def test_set_orders_only_writes_moved_objects(self):
+        """Objects outside the moved range keep their sort_order untouched."""
+        for i in range(1, 7):
+            Task.objects.create(sort_order=i, pk=i)
+
+        # Move task 2 below task 4.
+        with self.assertNumQueries(4):
+            Task.objects.set_orders(['1', '3', '4', '2', '5', '6'])
+
+        self.assertSequenceEqual(
+            Task.objects.values_list('pk', flat=True),
+            [1, 3, 4, 2, 5, 6],
+        )
+
+
+class TestOrderableQuerysetUniqueTogether(TestCase):
+    def test_set_orders(self):
+        """Changed objects are lifted out of the way of unique_together clashes."""
+        task = Task.objects.create()
+        subtasks = [SubTask.objects.create(task=task) for i in range(4)]
+
+        with self.assertNumQueries(6):
+            """
+            SELECT id, sort_order, SAVEPOINT, SELECT MAX(sort_order),
+            UPDATE (lift), UPDATE (CASE), RELEASE SAVEPOINT.
+            """
+            task.subtask_set.set_orders([s.pk for s in subtasks[::-1]])
+
+        self.assertSequenceEqual(task.subtask_set.all(), subtasks[::-1])
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('sort_order', flat=True),
+            [1, 2, 3, 4],
+        )
+
+
+class TestRenumber(TestCase):
+    def test_renumber(self):
+        """Objects are numbered from 1 in their current order."""
+        Task.objects.create(sort_order=2, pk=1)
+        Task.objects.create(sort_order=7, pk=2)
+        Task.objects.create(sort_order=1, pk=3)
+
+        # Only pk=2 needs a new sort_order.
+        self.assertEqual(Task.objects.renumber(), 1)
+
+        self.assertSequenceEqual(
+            Task.objects.values_list('pk', 'sort_order'),
+            [(3, 1), (1, 2), (2, 3)],
+        )
+
+    def test_renumber_gapped(self):
+        """Models with a sort_order_gap are spaced out by the gap."""
+        GappedTask.objects.create(sort_order=1, pk=1)
+        GappedTask.objects.create(sort_order=2, pk=2)
+
+        GappedTask.objects.renumber()
+
+        self.assertSequenceEqual(
+            GappedTask.objects.values_list('pk', 'sort_order'),
+            [(1, 4), (2, 8)],
+        )
+
+    def test_renumber_groups(self):
+        """Each unique_together group is numbered on its own."""
+        task_1 = Task.objects.create()
+        task_2 = Task.objects.create()
+        subtasks = [
+            SubTask.objects.create(task=task_1, sort_order=5),
+            SubTask.objects.create(task=task_1, sort_order=9),
+            SubTask.objects.create(task=task_2, sort_order=2),
+        ]
+
+        SubTask.objects.renumber(start=0, step=10)
+
+        self.assertSequenceEqual(
+            SubTask.objects.order_by('pk').values_list('sort_order', flat=True),
+            [0, 10, 0],
+        )
+        self.assertSequenceEqual(task_1.subtask_set.all(), subtasks[:2])
+
+    def test_renumber_duplicates(self):
+        """Objects with the same sort_order are separated, in pk order."""
+        Task.objects.create(sort_order=3, pk=1)
+        Task.objects.create(sort_order=3, pk=2)
+        Task.objects.create(sort_order=2, pk=3)
+
+        with self.assertNumQueries(1):
+            # Queries:
+            #     Renumber with ROW_NUMBER() in one UPDATE
+            self.assertEqual(Task.objects.renumber(), 2)
+
+        self.assertSequenceEqual(
+            Task.objects.values_list('pk', 'sort_order'),
+            [(3, 1), (1, 2), (2, 3)],
+        )
+
+    def test_renumber_unique(self):
+        """Objects are written out of the way of each other first."""
+        task = Task.objects.create()
+        subtasks = [
+            SubTask.objects.create(task=task, sort_order=sort_order)
+            for sort_order in [2, 3, 5]
+        ]
+
+        with self.assertNumQueries(5):
+            # Queries:
+            #     Savepoint
+            #     Find the end of the list
+            #     Write the new sort_orders above the end of the list
+            #     Drop them into place
+            #     Release savepoint
+            self.assertEqual(SubTask.objects.renumber(), 3)
+
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('sort_order', flat=True), [1, 2, 3],
+        )
+        self.assertSequenceEqual(task.subtask_set.all(), subtasks)
+
+    def test_renumber_batch_size(self):
+        """With a batch_size, objects are read and written in batches."""
+        task = Task.objects.create()
+        for sort_order in [2, 3, 5]:
+            SubTask.objects.create(task=task, sort_order=sort_order)
+
+        SubTask.objects.renumber(start=10, batch_size=2)
+
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('sort_order', flat=True), [10, 11, 12],
+        )
+
+    def test_renumber_batches_bounded(self):
+        """No UPDATE names the pks of more than one batch."""
+        task = Task.objects.create()
+        subtasks = [
+            SubTask.objects.create(task=task, sort_order=sort_order)
+            for sort_order in [2, 4, 6, 8, 10]
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            SubTask.objects.renumber(batch_size=2)
+
+        for query in queries:
+            for pks in re.findall(r' IN \(([^)]*)\)', query['sql']):
+                self.assertLessEqual(len(pks.split(',')), 2)
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('sort_order', flat=True), [1, 2, 3, 4, 5],
+        )
+        self.assertSequenceEqual(task.subtask_set.all(), subtasks)
+
+    def test_renumber_filtered_batches(self):
+        """Only the filtered objects are renumbered, around the rest of the list."""
+        tasks = [Task.objects.create(sort_order=sort_order) for sort_order in [2, 4, 9]]
+
+        count = Task.objects.filter(sort_order__lt=5).renumber(start=5, batch_size=1)
+
+        self.assertEqual(count, 2)
+        self.assertSequenceEqual(
+            Task.objects.values_list('sort_order', flat=True), [5, 6, 9],
+        )
+        self.assertSequenceEqual(Task.objects.all(), tasks)
+
+    def test_renumber_dry_run(self):
+        Task.objects.create(sort_order=1)
+        Task.objects.create(sort_order=5)
+
+        for batch_size in [None, 2]:
+            with self.subTest(batch_size=batch_size):
+                count = Task.objects.renumber(batch_size=batch_size, dry_run=True)
+                self.assertEqual(count, 1)
+                self.assertSequenceEqual(
+                    Task.objects.values_list('sort_order', flat=True), [1, 5],
+                )
+
+
+class TestBulkInsert(TestCase):
+    def test_save_after_insert(self):
+        """A sort_order set before the insert isn't treated as a later move."""
+        task = Task.objects.create()
+        items = [SubTask.objects.create(task=task) for i in range(3)]
+        new = SubTask(task=task, sort_order=10)
+        SubTask.objects.bulk_insert_at([new], 1)
+
+        new.title = 'Renamed'
+        new.save()
+
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('pk', 'sort_order'),
+            [(new.pk, 1)] + [(item.pk, i) for i, item in enumerate(items, 2)],
+        )
+
+    def test_bulk_append(self):
+        """New objects go on the end of the list in the order given."""
+        old = Task.objects.create()
+
+        with self.assertNumQueries(4):
+            # Queries:
+            #     Savepoint
+            #     Find the end of the list
+            #     Insert the new objects
+            #     Release savepoint
+            new = Task.objects.bulk_append([Task(), Task(), Task()])
+
+        self.assertSequenceEqual(
+            Task.objects.values_list('sort_order', flat=True), [1, 2, 3, 4],
+        )
+        self.assertSequenceEqual(
+            [task.sort_order for task in new], [2, 3, 4],
+        )
+        self.assertEqual(Task.objects.first(), old)
+
+    def test_bulk_append_to_empty_list(self):
+        Task.objects.bulk_append([Task()])
+        self.assertSequenceEqual(Task.objects.values_list('sort_order', flat=True), [1])
+
+    def test_bulk_append_groups(self):
+        """Each unique_together group is appended to separately, in one query."""
+        task_1 = Task.objects.create()
+        task_2 = Task.objects.create()
+        task_3 = Task.objects.create()
+        SubTask.objects.create(task=task_1)
+        SubTask.objects.create(task=task_1)
+        SubTask.objects.create(task=task_2)
+
+        with self.assertNumQueries(4):
+            SubTask.objects.bulk_append([
+                SubTask(task=task_1),
+                SubTask(task=task_2),
+                SubTask(task=task_1),
+                SubTask(task=task_3),
+            ])
+
+        self.assertSequenceEqual(
+            task_1.subtask_set.values_list('sort_order', flat=True), [1, 2, 3, 4],
+        )
+        self.assertSequenceEqual(
+            task_2.subtask_set.values_list('sort_order', flat=True), [1, 2],
+        )
+        self.assertSequenceEqual(
+            task_3.subtask_set.values_list('sort_order', flat=True), [1],
+        )
+
+    def test_bulk_append_gapped(self):
+        GappedTask.objects.create()
+        GappedTask.objects.bulk_append([GappedTask(), GappedTask()])
+
+        self.assertSequenceEqual(
+            GappedTask.objects.values_list('sort_order', flat=True), [4, 8, 12],
+        )
+
+    def test_bulk_insert_at(self):
+        """The rest of the list is shifted along to make room."""
+        task = Task.objects.create()
+        old = [SubTask.objects.create(task=task) for i in range(3)]
+
+        new = SubTask.objects.bulk_insert_at(
+            [SubTask(task=task), SubTask(task=task)], position=2,
+        )
+
+        self.assertSequenceEqual(
+            task.subtask_set.all(), [old[0], new[0], new[1], old[1], old[2]],
+        )
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('sort_order', flat=True), [1, 2, 3, 4, 5],
+        )
+
+
+class TestWithNeighbours(TestCase):
+    def test_with_neighbours(self):
+        """Each object is annotated with its neighbours in one query."""
+        Task.objects.create(sort_order=2, pk=1)
+        Task.objects.create(sort_order=5, pk=2)
+        Task.objects.create(sort_order=1, pk=3)
+
+        with self.assertNumQueries(1):
+            tasks = list(Task.objects.with_neighbours(rank=True))
+
+        self.assertSequenceEqual(
+            [(task.pk, task.prev_pk, task.next_pk, task.sort_rank) for task in tasks],
+            [(3, None, 1, 1), (1, 3, 2, 2), (2, 1, None, 3)],
+        )
+
+    def test_with_neighbours_groups(self):
+        """Neighbours are only looked for in the same unique_together group."""
+        task_1 = Task.objects.create()
+        task_2 = Task.objects.create()
+        subtask_1 = SubTask.objects.create(task=task_1)
+        SubTask.objects.create(task=task_2)
+        subtask_3 = SubTask.objects.create(task=task_1)
+
+        subtasks = SubTask.objects.with_neighbours().order_by('pk')
+
+        self.assertSequenceEqual(
+            [(subtask.prev_pk, subtask.next_pk) for subtask in subtasks],
+            [(None, subtask_3.pk), (None, None), (subtask_1.pk, None)],
+        )
+
+    def test_next_and_prev(self):
+        """next() and prev() use the annotations instead of searching the list."""
+        Task.objects.create()
+        Task.objects.create()
+
+        first, last = Task.objects.with_neighbours()
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(first.prev())
+            self.assertIsNone(last.next())
+        with self.assertNumQueries(1):
+            self.assertEqual(first.next(), last)
+
+    def test_filtered_after(self):
+        """Filters added afterwards also limit the neighbours."""
+        first = Task.objects.create()
+        Task.objects.create()
+
+        task = Task.objects.with_neighbours().get(pk=first.pk)
+
+        self.assertIsNone(task.next_pk)
+
+    def test_moved(self):
+        """Once an object has moved, next() and prev() search the list again."""
+        tasks = [Task.objects.create() for i in range(3)]
+
+        first = Task.objects.with_neighbours().get(pk=tasks[0].pk)
+        first.move_to(3)
+        self.assertIsNone(first.next())
+        self.assertEqual(first.prev(), tasks[2])
+
+        first = Task.objects.with_neighbours()[0]
+        first.sort_order = 3
+        first.save()
+        self.assertIsNone(first.next())
+        self.assertEqual(first.prev(), tasks[0])
+
+
+class TestDeleteClosingGaps(TestCase):
+    def test_not_on_manager(self):
+        """As with QuerySet.delete(), the manager has no delete()."""
+        self.assertFalse(hasattr(Task.objects, 'delete'))
+        self.assertFalse(hasattr(CompactTask.objects, 'delete'))
+
+    def test_delete(self):
+        """Each object moves down by the number of objects deleted before it."""
+        items = [CompactTask.objects.create() for i in range(6)]
+
+        with self.assertNumQueries(5):
+            # Queries:
+            #     Savepoint
+            #     Get the sort_orders of the objects being deleted
+            #     Delete them
+            #     Shift the rest of the list down
+            #     Release savepoint
+            CompactTask.objects.filter(sort_order__in=[2, 3, 5]).delete()
+
+        self.assertSequenceEqual(
+            CompactTask.objects.values_list('pk', 'sort_order'),
+            [(items[0].pk, 1), (items[3].pk, 2), (items[5].pk, 3)],
+        )
+
+    def test_delete_groups(self):
+        """Each list is shifted on its own, lifting the objects clear first."""
+        task_1 = Task.objects.create()
+        task_2 = Task.objects.create()
+        items_1 = [CompactSubTask.objects.create(task=task_1) for i in range(4)]
+        items_2 = [CompactSubTask.objects.create(task=task_2) for i in range(3)]
+
+        with self.assertNumQueries(10):
+            # Queries:
+            #     Savepoint
+            #     Get the sort_orders of the objects being deleted
+            #     Delete them
+            #     For each list:
+            #         Find the end of the list
+            #         Lift the rest of the list clear of it, shifted down
+            #         Drop it back into place
+            #     Release savepoint
+            CompactSubTask.objects.filter(
+                pk__in=[items_1[0].pk, items_1[2].pk, items_2[1].pk],
+            ).delete()
+
+        self.assertSequenceEqual(
+            task_1.compactsubtask_set.values_list('pk', 'sort_order'),
+            [(items_1[1].pk, 1), (items_1[3].pk, 2)],
+        )
+        self.assertSequenceEqual(
+            task_2.compactsubtask_set.values_list('pk', 'sort_order'),
+            [(items_2[0].pk, 1), (items_2[2].pk, 2)],
+        )
+
+    def test_delete_end(self):
+        """Deleting the end of a list doesn't shift anything."""
+        items = [CompactSubTask.objects.create(task=Task.objects.create())]
+
+        CompactSubTask.objects.filter(pk=items[0].pk).delete()
+
+        self.assertFalse(CompactSubTask.objects.exists())
+
+
+class TestIterOrdered(TestCase):
+    def test_iter_ordered(self):
+        """Objects come list by list, in order, however they were created."""
+        task_1 = Task.objects.create()
+        task_2 = Task.objects.create()
+        item_1 = SubTask.objects.create(task=task_2)
+        item_2 = SubTask.objects.create(task=task_1)
+        item_3 = SubTask.objects.create(task=task_2, sort_order=1)
+
+        self.assertEqual(
+            list(SubTask.objects.iter_ordered(chunk_size=1)), [item_2, item_3, item_1],
+        )
+
+
+class TestPositions(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create()
+        self.items = [
+            CompactSubTask.objects.create(task=self.task) for i in range(5)
+        ]
+        self.tasks = [Task.objects.create(sort_order=i * 10) for i in range(1, 5)]
+
+    def test_at(self):
+        self.assertEqual(self.task.compactsubtask_set.at(3), self.items[2])
+
+    def test_django_version(self):
+        """Filtering on the ROW_NUMBER() window needs Django 4.2, as in setup.py."""
+        self.assertGreaterEqual(django.VERSION[:2], (4, 2))
+
+    def test_at_with_gaps(self):
+        self.assertEqual(Task.objects.exclude(pk=self.task.pk).at(2), self.tasks[1])
+
+    def test_at_missing(self):
+        with self.assertRaises(CompactSubTask.DoesNotExist):
+            self.task.compactsubtask_set.at(6)
+
+    def test_range(self):
+        items = self.task.compactsubtask_set.range(2, 4)
+
+        self.assertEqual(list(items), self.items[1:3])
+        self.assertEqual([item.sort_rank for item in items], [2, 3])
+
+    def test_range_with_gaps(self):
+        tasks = Task.objects.exclude(pk=self.task.pk).range(2, 4)
+
+        self.assertEqual(list(tasks), self.tasks[1:3])
+
+    def test_range_per_list(self):
+        """Positions count from the start of each list."""
+        other = Task.objects.create()
+        other_items = [CompactSubTask.objects.create(task=other) for i in range(2)]
+
+        items = CompactSubTask.objects.range(2, 3).order_by('task', 'sort_order')
+
+        self.assertEqual(list(items), [self.items[1], other_items[1]])
+
+    def test_close_gaps_with_gap(self):
+        """
+        sort_order_close_gaps only closes the gaps left by deletes.
+
+        Objects saved past the end of the list still leave a gap.
+        """
+        item = CompactTask.objects.create()
+        far = CompactTask.objects.create(sort_order=10)
+
+        self.assertEqual(CompactTask.objects.at(2), far)
+        self.assertEqual(CompactTask.objects.position_of(far), 2)
+        self.assertSequenceEqual(CompactTask.objects.range(1, 3), [item, far])
+
+    def test_position_of(self):
+        """
+        The objects before it are counted.
+
+        # Queries:
+            SELECT the object's sort_order.
+            SELECT COUNT the objects before it.
+        """
+        tasks = Task.objects.exclude(pk=self.task.pk)
+
+        with self.assertNumQueries(2):
+            position = tasks.position_of(self.tasks[2])
+        self.assertEqual(position, 3)
+
+    def test_position_of_in_list(self):
+        self.assertEqual(CompactSubTask.objects.position_of(self.items[3]), 4)
+
+    def test_position_of_missing(self):
+        with self.assertRaises(Task.DoesNotExist):
+            Task.objects.exclude(pk=self.task.pk).position_of(self.task)
+
+
+class TestMoveToGroup(TestCase):
+    def setUp(self):
+        self.source, self.target = Task.objects.create(), Task.objects.create()
+        self.items = [SubTask.objects.create(task=self.source) for i in range(5)]
+        self.others = [SubTask.objects.create(task=self.target) for i in range(3)]
+
+    def assertOrder(self, task, expected):
+        self.assertSequenceEqual(task.subtask_set.all(), expected)
+        self.assertSequenceEqual(
+            task.subtask_set.values_list('sort_order', flat=True),
+            list(range(1, len(expected) + 1)),
+        )
+
+    def test_append(self):
+        """The objects keep their order at the end of the target, closing the gaps."""
+        item1, item2, item3, item4, item5 = self.items
+        moving = SubTask.objects.filter(pk__in=[item4.pk, item2.pk])
+
+        moved = moving.move_to_group(self.target)
+
+        self.assertCountEqual(moved, [item2, item4])
+        self.assertOrder(self.source, [item1, item3, item5])
+        self.assertOrder(self.target, self.others + [item2, item4])
+
+    def test_position(self):
+        item1, item2, item3, item4, item5 = self.items
+        other1, other2, other3 = self.others
+        moving = SubTask.objects.filter(pk__in=[item1.pk, item5.pk])
+
+        moving.move_to_group({'task': self.target}, position=2)
+
+        self.assertOrder(self.source, [item2, item3, item4])
+        self.assertOrder(self.target, [other1, item1, item5, other2, other3])
+
+    def test_within_target(self):
+        """Objects already in the target list are moved too."""
+        item1, item2, item3, item4, item5 = self.items
+        other1, other2, other3 = self.others
+        moving = SubTask.objects.filter(pk__in=[item3.pk, other1.pk])
+
+        moving.move_to_group(self.target.pk, position=1)
+
+        self.assertOrder(self.source, [item1, item2, item4, item5])
+        self.assertOrder(self.target, [item3, other1, other2, other3])
+
+    def test_queryset_order(self):
+        item1, item2, item3, item4, item5 = self.items
+        moving = SubTask.objects.filter(pk__in=[item2.pk, item4.pk]).order_by('-pk')
+
+        moving.move_to_group(self.target, keep_relative_order=False)
+
+        self.assertOrder(self.target, self.others + [item4, item2])
+
+    def test_queries(self):
+        """
+        Moving objects takes a fixed number of queries, however many move.
+
+        # Queries:
+            SAVEPOINT
+            SELECT the objects.
+            SELECT MIN sort_order of the lists.
+            UPDATE the objects, parked below the lists.
+            SELECT MAX sort_order of the source, for closing its gaps.
+            UPDATE the source objects after the gaps, lifted.
+            UPDATE the source objects back down.
+            SELECT MAX sort_order of the target.
+            UPDATE the objects into the target.
+            RELEASE SAVEPOINT
+        """
+        moving = SubTask.objects.filter(pk__in=[item.pk for item in self.items[1:4]])
+
+        with self.assertNumQueries(10):
+            moving.move_to_group(self.target)
+
+        self.assertOrder(self.source, [self.items[0], self.items[4]])
+        self.assertOrder(self.target, self.others + self.items[1:4])
+
+    def test_compact(self):
+        item = CompactSubTask.objects.create(task=self.source)
+        moved = CompactSubTask.objects.create(task=self.source)
+        existing = CompactSubTask.objects.create(task=self.target)
+
+        CompactSubTask.objects.filter(pk=moved.pk).move_to_group(self.target)
+
+        self.assertSequenceEqual(self.source.compactsubtask_set.all(), [item])
+        self.assertSequenceEqual(self.target.compactsubtask_set.all(), [existing, moved])
+
+    def test_empty(self):
+        self.assertFalse(SubTask.objects.none().move_to_group(self.target))
+
+    def test_one_list(self):
+        with self.assertRaises(ValueError):
+            Task.objects.all().move_to_group(self.target)
+
+    def test_wrong_fields(self):
+        with self.assertRaises(ValueError):
+            SubTask.objects.all().move_to_group({'sort_order': 1})